@@ -0,0 +1,58 @@
+"""Headless access to the dashboard's indicator data: loaders, queries and rollups.
+
+Nothing here imports Streamlit, and the submodules (and pandas) are only imported
+when one of their names is first used, so importing the package is cheap in batch
+jobs and worker processes:
+
+    from inequality_data import filter_series, get_gini_data
+
+    gini_df = get_gini_data()
+    nordics_df = filter_series(gini_df, ['Denmark', 'Finland', 'Norway', 'Sweden'], 2000, 2020)
+
+Results are cached in process memory by default; see inequality_data.cache to
+share them between processes instead.
+"""
+import importlib
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    'GDP_DEFLATOR_CODE': 'loaders',
+    'GINI_CODE': 'loaders',
+    'POVERTY_CODE': 'loaders',
+    'get_country_groups': 'loaders',
+    'get_correlations': 'loaders',
+    'get_coverage': 'loaders',
+    'get_cross_section': 'loaders',
+    'get_filled_series': 'loaders',
+    'get_gdp_data': 'loaders',
+    'get_gini_data': 'loaders',
+    'get_indicator_data': 'loaders',
+    'get_indicator_names': 'loaders',
+    'get_indicator_panel': 'loaders',
+    'get_poverty_data': 'loaders',
+    'get_rollups': 'loaders',
+    'get_series_frame': 'loaders',
+    'get_series_with_rollups': 'loaders',
+    'get_trends': 'loaders',
+    'get_wiid_coverage': 'loaders',
+    'get_wiid_data': 'loaders',
+    'null_perc': 'loaders',
+    'filter_series': 'queries',
+    'get_inequality_ratios': 'queries',
+    'get_percentile_bands': 'queries',
+    'get_quintile_shares': 'queries',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'{__name__}.{_EXPORTS[name]}'), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
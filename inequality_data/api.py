@@ -0,0 +1,313 @@
+"""HTTP API serving the dashboard's series as JSON or Arrow.
+
+    python -m inequality_data.api [--host 127.0.0.1] [--port 8000]
+
+Endpoints:
+
+    GET /series                                 code and name of every series
+    GET /series/{code}?countries=&from=&to=     one series (Gini, poverty, GDP deflator, any indicator)
+    GET /wiid/ratios/{country}?from=&to=        WIID inequality ratios of one country
+    GET /export?series=&countries=&from=&to=    a download of any series as format=csv or parquet
+
+`countries` takes country or rollup codes (DEU,FRA,Region:South Asia), and
+/export's `series` takes series codes, both comma separated or repeated and
+defaulting to all of them. Pass format=arrow, or Accept:
+application/vnd.apache.arrow.stream, for an Arrow IPC stream instead of JSON.
+
+Responses are built with the same cached loaders as the dashboard. Each carries a
+weak ETag derived from the versions of the series it was built from, so clients
+revalidating with If-None-Match get a 304 without touching the data until a refresh
+bumps the version. Bodies are serialized and gzipped once per query and version.
+
+The handlers are plain functions, which Starlette runs in its threadpool: even
+the version lookups read files, and a cold cache parses whole series, so none
+of it may block the event loop and the other requests waiting on it.
+
+Exports are not cached: they are streamed, one series at a time (see
+inequality_data.export), so that downloading every series does not hold the
+whole file in memory.
+"""
+import argparse
+import contextlib
+import gzip
+import hashlib
+import io
+import json
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from inequality_data import export
+from inequality_data.cache import MemoryCache, cached
+from inequality_data.loaders import (
+    GINI_CODE,
+    INDICATORS_FILENAME,
+    POVERTY_CODE,
+    get_indicator_names,
+    get_series_with_rollups,
+    get_wiid_data,
+    read_store_file,
+    rollup_version,
+)
+from inequality_data.queries import get_inequality_ratios
+from inequality_data.store import DATA_DIR, WIID_FILENAME, WIID_SERIES, file_revision, series_version
+
+# Part of every ETag, so changing the response layout invalidates clients' copies
+API_VERSION = 1
+JSON_TYPE = 'application/json'
+ARROW_TYPE = 'application/vnd.apache.arrow.stream'
+# Bodies smaller than this are sent uncompressed
+MIN_GZIP_SIZE = 512
+WDI_FILENAMES = {GINI_CODE: 'gini_data.csv', POVERTY_CODE: 'poverty_headcount_ratio_data.csv'}
+
+# Encoded responses are kept apart from the loaders' cache, so a burst of distinct
+# queries can't evict the frames the dashboard is using
+_responses = MemoryCache(max_entries=1024)
+
+
+class QueryError(ValueError):
+    """A malformed query parameter, reported to the client as a 400."""
+
+
+def get_series_names():
+    """Map each series code served by the API to its name."""
+    return load_series_names(tuple(file_revision(filename) for filename in (INDICATORS_FILENAME, *WDI_FILENAMES.values())))
+
+@cached
+def load_series_names(revisions):
+    names = {}
+    for code, filename in WDI_FILENAMES.items():
+        raw_df = read_store_file(filename, file_revision(filename))
+        names[code] = raw_df['Indicator Name'].iat[0]
+    names.update({code: name for name, code in get_indicator_names().items()})
+    return names
+
+
+def series_table(code, countries, from_year, to_year):
+    """Rows of one series with a value, as country_code / country / year / value columns."""
+    df = get_series_with_rollups(code, 'Value').dropna(subset=['Value'])
+    mask = df['Year'].between(from_year if from_year is not None else -float('inf'),
+                              to_year if to_year is not None else float('inf'))
+    if countries:
+        mask &= df['Country Code'].isin(countries)
+    df = df.loc[mask, ['Country Code', 'Country Name', 'Year', 'Value']]
+    df.columns = ['country_code', 'country', 'year', 'value']
+    return df.astype({'year': int})
+
+
+def export_tables(codes, countries, from_year, to_year):
+    """series_table of each series in turn, with its code and name in front, for an export."""
+    names = get_series_names()
+    for code in codes:
+        df = series_table(code, countries, from_year, to_year)
+        df.insert(0, 'series', names[code])
+        df.insert(0, 'series_code', code)
+        yield df
+
+
+def ratios_table(country, from_year, to_year):
+    """WIID inequality ratios of one country as year / metric / value columns."""
+    wiid_df = get_wiid_data()
+    country_years = wiid_df.loc[wiid_df['country'] == country, 'year']
+    if country_years.empty:
+        raise LookupError(f'No WIID data for {country!r}')
+    metrics_long = get_inequality_ratios(
+        wiid_df,
+        country,
+        from_year if from_year is not None else country_years.min(),
+        to_year if to_year is not None else country_years.max(),
+    ).dropna(subset=['value'])
+    return metrics_long[['year', 'metric', 'value']].astype({'year': int})
+
+
+def encode(df, meta, fmt):
+    """Serialize a table to (body, gzipped body or None)."""
+    if fmt == 'arrow':
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=False).replace_schema_metadata(
+            {key: str(value) for key, value in meta.items()}
+        )
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        body = sink.getvalue()
+    else:
+        # Column-oriented, so field names are sent once rather than per row
+        payload = dict(meta, columns={col: df[col].tolist() for col in df.columns})
+        body = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode()
+    gzipped = gzip.compress(body, compresslevel=6, mtime=0) if len(body) >= MIN_GZIP_SIZE else None
+    return body, gzipped
+
+
+def make_etag(key):
+    return 'W/"' + hashlib.blake2b(repr((API_VERSION, key)).encode(), digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(request, etag):
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+    return '*' in candidates or etag.removeprefix('W/') in candidates
+
+
+def response_format(request):
+    fmt = request.query_params.get('format')
+    if fmt is None:
+        fmt = 'arrow' if ARROW_TYPE in request.headers.get('accept', '') else 'json'
+    if fmt not in ('json', 'arrow'):
+        raise QueryError("format must be 'json' or 'arrow'")
+    return fmt
+
+
+def year_param(request, name):
+    value = request.query_params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise QueryError(f'{name!r} must be a year, got {value!r}')
+
+
+def list_param(request, name):
+    codes = [code.strip() for value in request.query_params.getlist(name) for code in value.split(',')]
+    return tuple(sorted({code for code in codes if code}))
+
+
+def countries_param(request):
+    return list_param(request, 'countries')
+
+
+def error(status_code, message):
+    return Response(json.dumps({'error': message}), status_code=status_code, media_type=JSON_TYPE)
+
+
+def conditional_response(request, key, fmt, build):
+    """Answer with a 304 if the client's copy is current, otherwise with the (cached) encoded body.
+
+    `key` must identify the query and the versions of every series it reads; `build`
+    returns the (table, metadata) to encode on a miss.
+    """
+    etag = make_etag(key)
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept, Accept-Encoding'}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    body, gzipped = _responses.get_or_compute(key, lambda: encode(*build(), fmt))
+    if gzipped is not None and 'gzip' in request.headers.get('accept-encoding', ''):
+        body = gzipped
+        headers['Content-Encoding'] = 'gzip'
+    return Response(body, media_type=ARROW_TYPE if fmt == 'arrow' else JSON_TYPE, headers=headers)
+
+
+def list_series(request):
+    names = get_series_names()
+    key = ('series', tuple(file_revision(filename) for filename in (INDICATORS_FILENAME, *WDI_FILENAMES.values())))
+    etag = make_etag(key)
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    body = json.dumps([{'code': code, 'name': name} for code, name in names.items()], separators=(',', ':'))
+    return Response(body, media_type=JSON_TYPE, headers=headers)
+
+
+def get_series(request):
+    code = request.path_params['code']
+    names = get_series_names()
+    if code not in names:
+        return error(404, f'Unknown series {code!r}')
+    try:
+        fmt = response_format(request)
+        countries = countries_param(request)
+        from_year = year_param(request, 'from')
+        to_year = year_param(request, 'to')
+    except QueryError as e:
+        return error(400, str(e))
+
+    # Rollups are weighted by population over the country groups, so their versions are part of the key too
+    versions = (series_version(code), rollup_version())
+    key = ('series', code, countries, from_year, to_year, fmt, versions)
+    meta = {'code': code, 'name': names[code]}
+    return conditional_response(
+        request, key, fmt, lambda: (series_table(code, countries, from_year, to_year), meta)
+    )
+
+
+def get_ratios(request):
+    country = request.path_params['country']
+    if not (DATA_DIR/WIID_FILENAME).exists():
+        return error(404, 'WIID data is not available')
+    try:
+        fmt = response_format(request)
+        from_year = year_param(request, 'from')
+        to_year = year_param(request, 'to')
+    except QueryError as e:
+        return error(400, str(e))
+
+    key = ('ratios', country, from_year, to_year, fmt, series_version(WIID_SERIES))
+    meta = {'country': country}
+    try:
+        return conditional_response(
+            request, key, fmt, lambda: (ratios_table(country, from_year, to_year), meta)
+        )
+    except LookupError as e:
+        return error(404, str(e))
+
+
+def get_export(request):
+    names = get_series_names()
+    codes = list_param(request, 'series') or tuple(names)
+    unknown = [code for code in codes if code not in names]
+    if unknown:
+        return error(404, f"Unknown series {', '.join(map(repr, unknown))}")
+    fmt = request.query_params.get('format', 'csv')
+    if fmt not in export.FORMATS:
+        return error(400, f"format must be one of {', '.join(export.FORMATS)}")
+    try:
+        countries = countries_param(request)
+        from_year = year_param(request, 'from')
+        to_year = year_param(request, 'to')
+    except QueryError as e:
+        return error(400, str(e))
+
+    filename = (codes[0] if len(codes) == 1 else 'inequality-data') + '.' + fmt
+    # The iterator is advanced in the threadpool too, one series at a time
+    return StreamingResponse(
+        export.iter_export(export_tables(codes, countries, from_year, to_year), fmt),
+        media_type=export.FORMATS[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # Read the series names before the first request, off the event loop
+    await run_in_threadpool(get_series_names)
+    yield
+
+
+app = Starlette(lifespan=lifespan, routes=[
+    Route('/series', list_series),
+    Route('/series/{code}', get_series),
+    Route('/wiid/ratios/{country}', get_ratios),
+    Route('/export', get_export),
+])
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description='Serve the indicator data over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--access-log', action='store_true', help='Log every request (slower)')
+    args = parser.parse_args(argv)
+    uvicorn.run(app, host=args.host, port=args.port, access_log=args.access_log)
+
+
+if __name__ == "__main__":
+    main()
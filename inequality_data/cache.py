@@ -0,0 +1,118 @@
+"""Pluggable cache for the loaders and derived tables.
+
+Functions decorated with `cached` store their results in the active backend,
+keyed by the function and its (hashable) arguments. The default backend keeps
+results in process memory; batch jobs can switch to a `DiskCache` shared by
+worker processes with `set_backend`.
+
+Cached results are shared, not copied, so callers must not modify them in place.
+"""
+import functools
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+
+class MemoryCache:
+    """Least-recently-used cache in process memory, safe to use from several threads.
+
+    Concurrent misses on the same key compute the value once.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._values:
+                self._values.move_to_end(key)
+                return self._values[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._values:
+                    return self._values[key]
+            try:
+                value = compute()
+                with self._lock:
+                    self._values[key] = value
+                    while len(self._values) > self.max_entries:
+                        self._values.popitem(last=False)
+            finally:
+                # Also when compute raises, so failing keys don't leave their lock behind
+                with self._lock:
+                    self._key_locks.pop(key, None)
+        return value
+
+    def get(self, key, default=None):
+        """Cached value of `key` without computing it on a miss."""
+        with self._lock:
+            if key in self._values:
+                self._values.move_to_end(key)
+                return self._values[key]
+        return default
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class DiskCache:
+    """Pickles results into a directory, so several processes can share them."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key):
+        return self.directory/f'{hashlib.sha256(repr(key).encode()).hexdigest()}.pkl'
+
+    def get_or_compute(self, key, compute):
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            pass
+        value = compute()
+        with tempfile.NamedTemporaryFile('wb', dir=self.directory, suffix='.tmp', delete=False) as tmp:
+            pickle.dump(value, tmp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp.name, path)
+        return value
+
+    def clear(self):
+        for path in self.directory.glob('*.pkl'):
+            path.unlink(missing_ok=True)
+
+
+# Room for every series' loaded frame, rollups, filled series and coverage at once
+# (about 330 entries), plus per-query tables such as trends, so that loading all of
+# them does not evict any
+_backend = MemoryCache(1024)
+
+
+def set_backend(backend):
+    """Use `backend` for every cached function from now on."""
+    global _backend
+    _backend = backend
+
+
+def get_backend():
+    return _backend
+
+
+def cached(func):
+    """Cache func's results in the active backend, keyed by its name and arguments."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())))
+        return _backend.get_or_compute(key, lambda: func(*args, **kwargs))
+    return wrapper
@@ -0,0 +1,107 @@
+"""Which (country, year) cells of a series hold data.
+
+A `Coverage` is built once per series version from its long-format frame and
+answers the questions the widgets ask on every rerun (which countries have data
+in these years, which years have data at all, which selected countries are
+empty) from a boolean country x year matrix, without scanning the frame again.
+"""
+import numpy as np
+import pandas as pd
+
+
+class Coverage:
+    """Boolean country x year matrix of a series, with the lookups the widgets need.
+
+    Countries keep the order of the frame they were built from. `flags` holds one
+    boolean per country for each flag column of the frame (e.g. 'Aggregate',
+    'Rollup'), which the lookups can exclude.
+    """
+
+    def __init__(self, countries, years, has_data, flags=None):
+        self.all_countries = np.asarray(countries, dtype=object)
+        self.all_years = np.asarray(years, dtype=int)
+        self.has_data = np.asarray(has_data, dtype=bool)
+        self.flags = flags or {}
+        self._country_index = {country: i for i, country in enumerate(self.all_countries)}
+        self._year_index = {year: i for i, year in enumerate(self.all_years)}
+        self._any_year = self.has_data.any(axis=1)
+        self._years_with_data = self.all_years[self.has_data.any(axis=0)]
+
+    @classmethod
+    def from_frame(cls, df, value_cols, country_col='Country Name', year_col='Year', how='any', flag_cols=('Aggregate', 'Rollup')):
+        """Build the coverage of a long-format frame.
+
+        A (country, year) cell has data if any (how='any') or all (how='all') of
+        `value_cols` are numbers in at least one of its rows.
+        """
+        if isinstance(value_cols, str):
+            value_cols = [value_cols]
+        present = df[value_cols].apply(pd.to_numeric, errors='coerce').notna()
+        present = present.any(axis=1) if how == 'any' else present.all(axis=1)
+
+        country_codes, countries = pd.factorize(df[country_col])
+        years = df[year_col].dropna().astype(int)
+        all_years = np.arange(years.min(), years.max() + 1) if len(years) else np.array([], dtype=int)
+
+        has_data = np.zeros((len(countries), len(all_years)), dtype=bool)
+        rows = present.to_numpy() & df[year_col].notna().to_numpy() & (country_codes >= 0)
+        year_positions = df[year_col].to_numpy()[rows].astype(int) - (all_years[0] if len(all_years) else 0)
+        has_data[country_codes[rows], year_positions] = True
+
+        flags = {}
+        for col in flag_cols:
+            if col in df:
+                flags[col] = df.groupby(country_codes)[col].any().reindex(range(len(countries)), fill_value=False).to_numpy()
+        return cls(countries, all_years, has_data, flags)
+
+    def _country_mask(self, exclude):
+        mask = np.ones(len(self.all_countries), dtype=bool)
+        for flag in exclude:
+            if flag in self.flags:
+                mask &= ~self.flags[flag]
+        return mask
+
+    def _year_slice(self, from_year, to_year):
+        if not len(self.all_years):
+            return slice(0, 0)
+        start = 0 if from_year is None else int(np.searchsorted(self.all_years, from_year, side='left'))
+        stop = len(self.all_years) if to_year is None else int(np.searchsorted(self.all_years, to_year, side='right'))
+        return slice(start, stop)
+
+    def countries(self, from_year=None, to_year=None, exclude=()):
+        """Countries with data in at least one year of the range (every year by default)."""
+        if from_year is None and to_year is None:
+            with_data = self._any_year
+        else:
+            with_data = self.has_data[:, self._year_slice(from_year, to_year)].any(axis=1)
+        return self.all_countries[with_data & self._country_mask(exclude)].tolist()
+
+    def years(self, countries=None):
+        """Years in which any of `countries` (any country by default) has data, ascending."""
+        if countries is None:
+            return self._years_with_data.tolist()
+        rows = [self._country_index[country] for country in countries if country in self._country_index]
+        return self.all_years[self.has_data[rows].any(axis=0)].tolist()
+
+    def year_range(self, countries=None):
+        """(first, last) year with data, or None if there is none."""
+        years = self.years(countries)
+        return (years[0], years[-1]) if years else None
+
+    def has(self, country, year):
+        i = self._country_index.get(country)
+        j = self._year_index.get(year)
+        return i is not None and j is not None and bool(self.has_data[i, j])
+
+    def missing(self, countries, from_year=None, to_year=None):
+        """The countries among `countries` without any data in the range."""
+        year_slice = self._year_slice(from_year, to_year)
+        return [
+            country for country in countries
+            if country not in self._country_index or not self.has_data[self._country_index[country], year_slice].any()
+        ]
+
+    def available(self, countries, from_year=None, to_year=None):
+        """The countries among `countries` with data in the range, in the given order."""
+        missing = set(self.missing(countries, from_year, to_year))
+        return [country for country in countries if country not in missing]
@@ -0,0 +1,120 @@
+"""Every series of every country side by side, one year at a time.
+
+The popular indicators, the Gini index and the poverty headcount ratio are
+stacked into one series x country x year array. A year's cross-section is a
+country x series slice of it: the scatter plots two of its columns, and
+`correlations` relates every pair of columns at once with a few matrix
+products, each pair over the countries where both series have a value.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+# Fewest countries with both values for a correlation to be reported
+MIN_COUNTRIES = 10
+
+
+def stack_wide(wide_df, codes, countries, years):
+    """Series x country x year array of a wide frame with a row per Series Code and Country Code and a column per year."""
+    year_cols = {int(re.search(r'\d{4}', col).group()): col for col in wide_df.columns if 'YR' in col}
+    panel = np.full((len(codes), len(countries), len(years)), np.nan)
+
+    series_idx = pd.Index(codes).get_indexer(wide_df['Series Code'])
+    country_idx = pd.Index(countries).get_indexer(wide_df['Country Code'])
+    rows = (series_idx >= 0) & (country_idx >= 0)
+    year_idx = pd.Index(years).get_indexer(list(year_cols))
+    cols = year_idx >= 0
+
+    values = wide_df[[col for col, keep in zip(year_cols.values(), cols) if keep]].to_numpy(dtype=float)[rows]
+    panel[series_idx[rows][:, None], country_idx[rows][:, None], year_idx[cols][None, :]] = values
+    return panel
+
+
+def correlations(values, min_countries=MIN_COUNTRIES):
+    """Pearson correlations between the columns of a country x series array, ignoring NaNs pairwise.
+
+    Each pair of series is compared over the countries where both have a value,
+    and is NaN when there are fewer than `min_countries` of them. Returns the
+    series x series correlation matrix and the matrix of country counts.
+    """
+    observed = ~np.isnan(values)
+    mask = observed.astype(float)
+    count = mask.sum(axis=0)
+
+    # r does not change when a series is shifted and scaled, and sums of squares of
+    # raw values (GDP in US$) would lose every digit, so standardize each series first
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(observed, values, 0).sum(axis=0) / count
+        centered = np.where(observed, values - mean, 0)
+        scale = np.sqrt((centered ** 2).sum(axis=0) / count)
+        z = np.where(observed & (scale > 0), centered / scale, 0)
+
+    # [i, j] sums run over the countries where both series i and j are observed
+    n = mask.T @ mask
+    sum_x = z.T @ mask
+    sum_xx = (z ** 2).T @ mask
+    sum_xy = z.T @ z
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = sum_xy - sum_x * sum_x.T / n
+        var = sum_xx - sum_x ** 2 / n
+        r = np.clip(cov / np.sqrt(var * var.T), -1, 1)
+    r[(n < min_countries) | (var <= 0) | (var.T <= 0)] = np.nan
+    return r, n.astype(int)
+
+
+class IndicatorPanel:
+    """Series x country x year array of every series, with the lookups of the scatter and correlation views.
+
+    Countries are the World Bank's economies only; their regions are kept for colouring.
+    """
+
+    def __init__(self, codes, countries, names, regions, years, values):
+        self.codes = list(codes)
+        self.countries = np.asarray(countries, dtype=object)
+        self.names = np.asarray(names, dtype=object)
+        self.regions = np.asarray(regions, dtype=object)
+        self.all_years = np.asarray(years, dtype=int)
+        self.values = values
+        self._series_index = {code: i for i, code in enumerate(self.codes)}
+        # Countries with data per series and year
+        self._counts = (~np.isnan(values)).sum(axis=1)
+
+    def year_values(self, year):
+        """Country x series array of one year (all NaN for a year outside the panel)."""
+        j = np.searchsorted(self.all_years, year)
+        if j == len(self.all_years) or self.all_years[j] != year:
+            return np.full((len(self.countries), len(self.codes)), np.nan)
+        return self.values[:, :, j].T
+
+    def years(self, codes=None, min_countries=1, min_series=2):
+        """Years in which at least min_countries countries have a value of every series of `codes`.
+
+        Without `codes`, the years in which at least min_series series have
+        min_countries countries with a value each.
+        """
+        if codes is None:
+            return self.all_years[(self._counts >= min_countries).sum(axis=0) >= min_series].tolist()
+        rows = [self._series_index[code] for code in codes]
+        countries_with_all = (~np.isnan(self.values[rows])).all(axis=0).sum(axis=0)
+        return self.all_years[countries_with_all >= min_countries].tolist()
+
+    def cross_section(self, year):
+        """One row per country with its name, code, region and a column of values per series code."""
+        frame = pd.DataFrame(self.year_values(year), columns=self.codes)
+        frame.insert(0, 'Country Name', self.names)
+        frame.insert(1, 'Country Code', self.countries)
+        frame.insert(2, 'Region', self.regions)
+        return frame
+
+    def correlations(self, year, min_countries=MIN_COUNTRIES):
+        """Long frame of the correlation of every pair of series in `year`, with the number of countries compared."""
+        r, n = correlations(self.year_values(year), min_countries)
+        x_idx, y_idx = np.indices(r.shape)
+        codes = np.asarray(self.codes, dtype=object)
+        return pd.DataFrame({
+            'X': codes[x_idx.ravel()],
+            'Y': codes[y_idx.ravel()],
+            'Correlation': r.ravel(),
+            'Countries': n.ravel(),
+        })
@@ -0,0 +1,82 @@
+"""Encode a stream of tables as one CSV or Parquet file, piece by piece.
+
+An export can cover every series, country and year, which as a single frame
+would be hundreds of MB. The encoders here take the rows as an iterable of
+frames (the query API hands over one series at a time) and yield the file's
+bytes as each frame is written, so memory holds one frame and its encoding
+whatever the size of the export:
+
+- CSV: a block of lines per frame, the header only before the first.
+- Parquet: a row group per frame; the footer indexing them is written last.
+"""
+import io
+
+# Columns of an export, in order
+COLUMNS = ['series_code', 'series', 'country_code', 'country', 'year', 'value']
+FORMATS = {'csv': 'text/csv', 'parquet': 'application/vnd.apache.parquet'}
+
+
+class _Sink(io.RawIOBase):
+    """Write-only file handing over what was written to it since the last `take`."""
+
+    def __init__(self):
+        self._pieces = []
+        self._size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._pieces.append(bytes(data))
+        self._size += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._size
+
+    def take(self):
+        data = b''.join(self._pieces)
+        self._pieces.clear()
+        return data
+
+
+def iter_csv(tables):
+    """Yield the CSV encoding of the frames in `tables`, one frame at a time."""
+    header = True
+    for df in tables:
+        if df.empty:
+            continue
+        yield df[COLUMNS].to_csv(index=False, header=header, lineterminator='\n').encode()
+        header = False
+    if header:
+        yield (','.join(COLUMNS) + '\n').encode()
+
+
+def iter_parquet(tables):
+    """Yield the Parquet encoding of the frames in `tables`, one row group per frame."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ('series_code', pa.string()),
+        ('series', pa.string()),
+        ('country_code', pa.string()),
+        ('country', pa.string()),
+        ('year', pa.int32()),
+        ('value', pa.float64()),
+    ])
+    sink = _Sink()
+    with pq.ParquetWriter(sink, schema, compression='zstd') as writer:
+        for df in tables:
+            if df.empty:
+                continue
+            writer.write_table(pa.Table.from_pandas(df[COLUMNS], schema=schema, preserve_index=False))
+            yield sink.take()
+    yield sink.take()
+
+
+def iter_export(tables, fmt):
+    """Yield the `fmt` ('csv' or 'parquet') encoding of the frames in `tables`."""
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}, got {fmt!r}")
+    return iter_csv(tables) if fmt == 'csv' else iter_parquet(tables)
@@ -0,0 +1,73 @@
+"""Gap-filling for sparse series such as the Gini and poverty estimates.
+
+The long frame is pivoted to a country x year array and every gap is filled in
+one pass: missing years between two observations are linearly interpolated, and
+years after a country's last observation carry it forward. Either only applies
+within `max_gap` missing years, so long stretches without surveys stay empty.
+"""
+import numpy as np
+import pandas as pd
+
+from inequality_data.rollups import to_panel
+
+# Longest run of missing years that is filled in
+MAX_GAP = 5
+
+
+def fill_panel(values, max_gap=MAX_GAP):
+    """Fill the gaps of a country x year array. Returns (filled values, imputed mask)."""
+    n_years = values.shape[1]
+    observed = ~np.isnan(values)
+    positions = np.arange(n_years)
+
+    # Index of the previous and next observation of every cell (-1 / n_years if none)
+    previous = np.maximum.accumulate(np.where(observed, positions, -1), axis=1)
+    following = np.minimum.accumulate(np.where(observed, positions, n_years)[:, ::-1], axis=1)[:, ::-1]
+
+    rows = np.arange(values.shape[0])[:, None]
+    previous_value = values[rows, np.clip(previous, 0, n_years - 1)]
+    following_value = values[rows, np.clip(following, 0, n_years - 1)]
+
+    has_previous = previous >= 0
+    has_following = following < n_years
+    interior = ~observed & has_previous & has_following & (following - previous - 1 <= max_gap)
+    trailing = ~observed & has_previous & ~has_following & (positions - previous <= max_gap)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight = (positions - previous) / (following - previous)
+        interpolated = previous_value + (following_value - previous_value) * weight
+
+    filled = values.copy()
+    filled[interior] = interpolated[interior]
+    filled[trailing] = previous_value[trailing]
+    return filled, interior | trailing
+
+
+def fill_gaps(long_df, value_col, max_gap=MAX_GAP):
+    """Long frame with the gaps of every country filled and an 'Imputed' flag on the filled rows.
+
+    Per-country columns (names, 'Aggregate', 'Rollup') are copied to the filled
+    rows; other per-year columns (e.g. a rollup's 'Coverage') are left empty there.
+    """
+    if long_df.empty:
+        return long_df.assign(Imputed=pd.Series(dtype=bool))
+    long_df = long_df.dropna(subset=[value_col])
+    other_cols = [col for col in long_df.columns if col not in ('Country Code', 'Year', value_col)]
+    per_country = long_df.groupby('Country Code')[other_cols].nunique(dropna=False).le(1).all()
+    country_cols = [col for col in other_cols if per_country[col]]
+    year_cols = [col for col in other_cols if not per_country[col]]
+    attributes = long_df[['Country Code'] + country_cols].drop_duplicates('Country Code').set_index('Country Code')
+    countries = attributes.index
+    years = np.arange(long_df['Year'].min(), long_df['Year'].max() + 1)
+
+    filled, imputed = fill_panel(to_panel(long_df, value_col, countries, years), max_gap)
+
+    # Back to long format, keeping only the cells that hold a value
+    country_idx, year_idx = np.nonzero(~np.isnan(filled))
+    filled_df = attributes.iloc[country_idx].reset_index()
+    filled_df['Year'] = years[year_idx]
+    filled_df[value_col] = filled[country_idx, year_idx]
+    filled_df['Imputed'] = imputed[country_idx, year_idx]
+    if year_cols:
+        filled_df = filled_df.merge(long_df[['Country Code', 'Year'] + year_cols], on=['Country Code', 'Year'], how='left')
+    return filled_df[list(long_df.columns) + ['Imputed']]
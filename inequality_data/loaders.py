@@ -0,0 +1,308 @@
+"""Cached loaders for the indicator datasets under data/.
+
+The public `get_*` loaders look up the current version of their series and pass
+it to a cached `load_*` function, so a data refresh only invalidates the series
+it touched.
+"""
+import numpy as np
+import pandas as pd
+
+from inequality_data import crosssection, gapfill, rollups, trends
+from inequality_data.cache import cached
+from inequality_data.coverage import Coverage
+from inequality_data.store import DATA_DIR, WIID_FILENAME, WIID_SERIES, file_revision, series_version
+
+GDP_DEFLATOR_CODE = 'NY.GDP.DEFL.KD.ZG'
+GINI_CODE = 'SI.POV.GINI'
+POVERTY_CODE = 'SI.POV.DDAY'
+INDICATORS_FILENAME = 'world_bank_popular_indicators.csv'
+
+@cached
+def read_store_file(filename, revision):
+    """Read a raw store file. `revision` changes whenever the file is rewritten."""
+    return pd.read_csv(DATA_DIR/filename, na_values='..')
+
+def rollup_version():
+    """Version of what every rollup and aggregate flag also depends on: the population series and the country groups."""
+    return (series_version(rollups.POPULATION_CODE), file_revision(rollups.COUNTRY_GROUPS_FILENAME))
+
+def flag_aggregates(series_df):
+    """Add the 'Aggregate' column flagging the World Bank aggregate rows, once per load, so filters don't have to scan names."""
+    series_df['Aggregate'] = rollups.aggregate_mask(series_df, get_country_groups())
+
+def get_gdp_data():
+    """Grab GDP deflator data from the world_bank_popular_indicators dataset."""
+    return load_gdp_data(series_version(GDP_DEFLATOR_CODE))
+
+@cached
+def load_gdp_data(version):
+    raw_gdp_df = read_store_file(INDICATORS_FILENAME, file_revision(INDICATORS_FILENAME))
+
+    MIN_YEAR = 2000
+    MAX_YEAR = 2015
+
+    # Filter the dataset for the specific Series Code
+    gdp_deflator_df = raw_gdp_df[raw_gdp_df['Series Code'] == GDP_DEFLATOR_CODE]
+
+    # Melt the dataset into long format
+    gdp_deflator_df = gdp_deflator_df.melt(
+        id_vars=['Country Name', 'Country Code', 'Series Name', 'Series Code'],
+        var_name='Year',
+        value_name='GDP Deflator'
+    )
+
+    # Convert Year to numeric and drop rows with missing GDP Deflator values
+    gdp_deflator_df['Year'] = gdp_deflator_df['Year'].str.extract(r'(\d{4})').astype(int)
+    gdp_deflator_df = gdp_deflator_df.dropna(subset=['GDP Deflator'])
+
+    return gdp_deflator_df
+
+def get_gini_data():
+    """Grab Gini data from a CSV file."""
+    return load_gini_data(series_version(GINI_CODE), file_revision(rollups.COUNTRY_GROUPS_FILENAME))
+
+@cached
+def load_gini_data(version, groups_revision):
+    raw_gini_df = read_store_file('gini_data.csv', file_revision('gini_data.csv'))
+
+    MIN_YEAR = 1960
+    MAX_YEAR = 2023
+
+    gini_df = raw_gini_df.melt(
+        ['Country Name','Country Code'],
+        [str(x) for x in range(MIN_YEAR, MAX_YEAR + 1)],
+        'Year',
+        'GINI',
+    )
+
+    # Convert years from string to integers
+    gini_df['Year'] = pd.to_numeric(gini_df['Year'])
+
+    # Most country-years have no estimate; keep only the ones that do
+    gini_df = gini_df.dropna(subset=['GINI'])
+
+    flag_aggregates(gini_df)
+
+    return gini_df
+
+def get_poverty_data():
+    """Grab Poverty Headcount Ratio data from a CSV file."""
+    return load_poverty_data(series_version(POVERTY_CODE), file_revision(rollups.COUNTRY_GROUPS_FILENAME))
+
+@cached
+def load_poverty_data(version, groups_revision):
+    raw_poverty_df = read_store_file('poverty_headcount_ratio_data.csv', file_revision('poverty_headcount_ratio_data.csv'))
+
+    # Melt the dataset into long format
+    poverty_df = raw_poverty_df.melt(
+        id_vars=['Country Name', 'Country Code', 'Indicator Name', 'Indicator Code'],
+        var_name='Year',
+        value_name='Poverty Headcount Ratio'
+    )
+
+    # Convert Year to numeric and drop rows with missing Poverty Headcount Ratio values
+    poverty_df['Year'] = pd.to_numeric(poverty_df['Year'], errors='coerce')
+    poverty_df = poverty_df.dropna(subset=['Poverty Headcount Ratio'])
+
+    flag_aggregates(poverty_df)
+
+    return poverty_df
+
+def get_indicator_names():
+    """Map each Series Name in the popular indicators dataset to its Series Code."""
+    raw_indicator_df = read_store_file(INDICATORS_FILENAME, file_revision(INDICATORS_FILENAME))
+    return dict(raw_indicator_df[['Series Name', 'Series Code']].drop_duplicates().itertuples(index=False))
+
+def get_indicator_data(series_code):
+    """Grab one series of the popular indicators dataset in long format."""
+    return load_indicator_data(series_code, series_version(series_code))
+
+@cached
+def load_indicator_data(series_code, version):
+    indicator_df = read_store_file(INDICATORS_FILENAME, file_revision(INDICATORS_FILENAME))
+    indicator_df = indicator_df[indicator_df['Series Code'] == series_code]
+
+    # Melt the dataset into long format
+    indicator_long_df = indicator_df.melt(
+        id_vars=['Series Name', 'Series Code', 'Country Name', 'Country Code'],
+        value_vars=[col for col in indicator_df.columns if 'YR' in col],
+        var_name='Year',
+        value_name='Value'
+    )
+
+    # Convert Year to numeric
+    indicator_long_df['Year'] = indicator_long_df['Year'].str.extract(r'(\d{4})').astype(int)
+
+    return indicator_long_df
+
+def get_country_groups():
+    """Grab the country -> region / income group mapping."""
+    return load_country_groups(file_revision(rollups.COUNTRY_GROUPS_FILENAME))
+
+@cached
+def load_country_groups(revision):
+    return rollups.read_country_groups()
+
+def get_series_frame(series_code):
+    """Long-format frame of any series and the name of its value column."""
+    if series_code == GINI_CODE:
+        return get_gini_data(), 'GINI'
+    if series_code == POVERTY_CODE:
+        return get_poverty_data(), 'Poverty Headcount Ratio'
+    return get_indicator_data(series_code), 'Value'
+
+def get_rollups(series_code, grouping):
+    """Population-weighted rollups of a series for every group of a grouping ('Region' or 'Income Group')."""
+    return load_rollups(series_code, grouping, series_version(series_code), rollup_version())
+
+@cached
+def load_rollups(series_code, grouping, version, rollups_version):
+    values_df, value_col = get_series_frame(series_code)
+    return rollups.weighted_rollup(
+        values_df, value_col, get_indicator_data(rollups.POPULATION_CODE), get_country_groups(), grouping
+    )
+
+def get_series_with_rollups(series_code, value_col=None):
+    """A series' country rows followed by its regional and income-group rollups.
+
+    'Aggregate' flags the World Bank's own aggregate rows and 'Rollup' the rows computed here.
+    The value column is renamed to `value_col` if given.
+    """
+    return load_series_with_rollups(series_code, value_col, series_version(series_code), rollup_version())
+
+@cached
+def load_series_with_rollups(series_code, value_col, version, rollups_version):
+    series_df, series_value_col = get_series_frame(series_code)
+    rollup_dfs = [get_rollups(series_code, grouping) for grouping in rollups.GROUPINGS]
+    combined_df = pd.concat(
+        [series_df.assign(Rollup=False)] + [rollup_df.assign(Rollup=True) for rollup_df in rollup_dfs],
+        ignore_index=True
+    )
+    if 'Aggregate' not in series_df:
+        combined_df['Aggregate'] = False
+    combined_df['Aggregate'] = combined_df['Aggregate'].fillna(False).astype(bool)
+    if value_col:
+        combined_df = combined_df.rename(columns={series_value_col: value_col})
+    return combined_df
+
+def get_filled_series(series_code, value_col=None, max_gap=gapfill.MAX_GAP):
+    """get_series_with_rollups with gaps of up to `max_gap` years filled in and flagged as 'Imputed'."""
+    return load_filled_series(series_code, value_col, max_gap, series_version(series_code), rollup_version())
+
+@cached
+def load_filled_series(series_code, value_col, max_gap, version, rollups_version):
+    series_df = get_series_with_rollups(series_code, value_col)
+    return gapfill.fill_gaps(series_df, value_col or get_series_frame(series_code)[1], max_gap)
+
+def get_coverage(series_code, filled=False):
+    """Which countries (and rollups) of a series have data in which years, counting filled gaps if `filled`."""
+    return load_coverage(series_code, filled, series_version(series_code), rollup_version())
+
+@cached
+def load_coverage(series_code, filled, version, rollups_version):
+    series_df = get_filled_series(series_code, 'Value') if filled else get_series_with_rollups(series_code, 'Value')
+    return Coverage.from_frame(series_df, 'Value')
+
+def get_trends(series_code, from_year, to_year):
+    """Change, CAGR, trend slope and volatility of every country (and rollup) of a series over a year range."""
+    return load_trends(series_code, from_year, to_year, series_version(series_code), rollup_version())
+
+@cached
+def load_trends(series_code, from_year, to_year, version, rollups_version):
+    return trends.trend_stats(get_series_with_rollups(series_code, 'Value'), 'Value', from_year, to_year)
+
+def panel_codes():
+    """Codes of the series in the indicator panel: Gini, poverty, then every popular indicator."""
+    return (GINI_CODE, POVERTY_CODE, *get_indicator_names().values())
+
+def panel_versions(codes):
+    # The panel keeps only the economies in the country groups, with their regions
+    return (*(series_version(code) for code in codes), file_revision(rollups.COUNTRY_GROUPS_FILENAME))
+
+def get_indicator_panel():
+    """Every panel series of every country as one series x country x year array (see crosssection.IndicatorPanel)."""
+    codes = panel_codes()
+    return load_indicator_panel(codes, panel_versions(codes))
+
+@cached
+def load_indicator_panel(codes, versions):
+    raw_indicator_df = read_store_file(INDICATORS_FILENAME, file_revision(INDICATORS_FILENAME))
+    country_groups = get_country_groups().set_index('Country Code')
+    survey_dfs = {GINI_CODE: (get_gini_data(), 'GINI'), POVERTY_CODE: (get_poverty_data(), 'Poverty Headcount Ratio')}
+
+    # Economies only, in the order of the indicators file
+    names = raw_indicator_df.drop_duplicates('Country Code').set_index('Country Code')['Country Name']
+    names = names[names.index.isin(country_groups.index)]
+    countries = names.index
+
+    indicator_years = [int(col[:4]) for col in raw_indicator_df.columns if 'YR' in col]
+    survey_years = [year for survey_df, _ in survey_dfs.values() for year in survey_df['Year'].dropna()]
+    all_years = indicator_years + survey_years
+    years = np.arange(min(all_years), max(all_years) + 1)
+
+    values = crosssection.stack_wide(raw_indicator_df, codes, countries, years)
+    for code, (survey_df, value_col) in survey_dfs.items():
+        values[codes.index(code)] = rollups.to_panel(survey_df, value_col, countries, years)
+    return crosssection.IndicatorPanel(
+        codes, countries, names.to_numpy(), country_groups['Region'].reindex(countries).to_numpy(), years, values
+    )
+
+def get_cross_section(year):
+    """One row per country with every panel series of `year` as a column named by its series code."""
+    codes = panel_codes()
+    return load_cross_section(year, panel_versions(codes))
+
+@cached
+def load_cross_section(year, versions):
+    return get_indicator_panel().cross_section(year)
+
+def get_correlations(year):
+    """Correlations across countries between every pair of panel series in `year` (columns X, Y, Correlation, Countries)."""
+    codes = panel_codes()
+    return load_correlations(year, panel_versions(codes))
+
+@cached
+def load_correlations(year, versions):
+    return get_indicator_panel().correlations(year)
+
+def null_perc(df):
+    percent_missing = df.isnull().sum() * 100 / len(df)
+    missing_value_df = pd.DataFrame({'percent_missing': percent_missing})
+    missing_value_df.sort_values('percent_missing', inplace=True, ascending=False)
+    return missing_value_df
+
+def get_wiid_data():
+    """Grab WIID (World Income Inequality Database) data from a CSV file."""
+    return load_wiid_data(series_version(WIID_SERIES))
+
+@cached
+def load_wiid_data(version):
+    wiid_df = pd.read_csv(DATA_DIR/WIID_FILENAME)
+    
+    # Convert numeric columns
+    numeric_columns = ['gini', 'mean', 'median', 'gdp', 'population']
+    for col in numeric_columns:
+        wiid_df[col] = pd.to_numeric(wiid_df[col], errors='coerce')
+    
+    # Convert year to integer
+    wiid_df['year'] = pd.to_numeric(wiid_df['year'], errors='coerce')
+    
+    # Drop rows with missing key values
+    wiid_df = wiid_df.dropna(subset=['country', 'year', 'gini'])
+    
+    return wiid_df
+
+# WIID columns each chart needs: quintile bars need every quintile, ratio lines any ratio
+WIID_COVERAGE_COLUMNS = {
+    'quintiles': (['q1', 'q2', 'q3', 'q4', 'q5'], 'all'),
+    'ratios': (['palma', 'ratio_top20bottom20'], 'any'),
+}
+
+def get_wiid_coverage(kind):
+    """Which countries have WIID data for a chart ('quintiles' or 'ratios') in which years."""
+    return load_wiid_coverage(kind, series_version(WIID_SERIES))
+
+@cached
+def load_wiid_coverage(kind, version):
+    value_cols, how = WIID_COVERAGE_COLUMNS[kind]
+    return Coverage.from_frame(get_wiid_data(), value_cols, country_col='country', year_col='year', how=how)
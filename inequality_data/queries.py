@@ -0,0 +1,93 @@
+"""Filters and derived tables computed from the loaded datasets."""
+import pandas as pd
+
+def filter_series(df, countries, from_year, to_year):
+    """Keep the rows of a long-format frame for the given countries and year range."""
+    return df[
+        (df['Country Name'].isin(countries))
+        & (df['Year'] <= to_year)
+        & (df['Year'] >= from_year)
+    ]
+
+def get_percentile_bands(df, value_col, percentiles=(10, 25, 50, 75, 90)):
+    """Percentiles of value_col across the countries of a long-format frame for each year.
+
+    Returns one row per year with a 'p<percentile>' column per percentile and the
+    number of countries with a value as 'Countries'.
+    """
+    grouped = df.dropna(subset=[value_col]).groupby('Year')[value_col]
+    bands = grouped.quantile([p / 100 for p in percentiles]).unstack()
+    bands.columns = [f'p{p}' for p in percentiles]
+    bands['Countries'] = grouped.size()
+    return bands.reset_index()
+
+def get_quintile_shares(wiid_df, countries, year):
+    """Income share of each quintile for the given countries in one WIID year, in long format."""
+    # Filter the data by selected countries and year
+    filtered_wiid_df = wiid_df[
+        (wiid_df['country'].isin(countries)) &
+        (wiid_df['year'] == year)
+    ]
+
+    # Ensure the quintile columns are numeric
+    quintile_cols = ['q1', 'q2', 'q3', 'q4', 'q5']
+    filtered_wiid_df = filtered_wiid_df.assign(**{
+        col: pd.to_numeric(filtered_wiid_df[col], errors='coerce') for col in quintile_cols
+    })
+
+    # Create a cleaner view of quintile data
+    quintile_data = filtered_wiid_df[['country', 'year'] + quintile_cols].dropna()
+
+    # Melt the dataframe for visualization
+    melted_wiid_df = quintile_data.melt(
+        id_vars=['country', 'year'],
+        value_vars=quintile_cols,
+        var_name='Quintile',
+        value_name='Income Share'
+    ).groupby(['country', 'Quintile'], as_index=False).sum()
+
+    # Create more readable quintile labels
+    melted_wiid_df['Quintile'] = pd.Categorical(
+        melted_wiid_df['Quintile'].map({
+            'q1': '0-20%',
+            'q2': '20-40%',
+            'q3': '40-60%',
+            'q4': '60-80%',
+            'q5': '80-100%'
+        }),
+        categories=['0-20%', '20-40%', '40-60%', '60-80%', '80-100%'],
+        ordered=True
+    )
+    return melted_wiid_df
+
+def get_inequality_ratios(wiid_df, country, from_year, to_year):
+    """Palma, Top20/Bottom20 and Upper/Lower Middle ratios of one country, in long format."""
+    # Filter data for selected country and years
+    metrics_df = wiid_df[
+        (wiid_df['country'] == country) &
+        (wiid_df['year'] >= from_year) &
+        (wiid_df['year'] <= to_year)
+    ].copy()
+
+    # Ensure only one value per country per year
+    metrics_df = metrics_df.drop_duplicates(subset=['country', 'year'])
+
+    # Calculate upper middle to lower middle ratio
+    metrics_df['upper_middle_to_lower'] = metrics_df['q4'] / metrics_df['q2']
+
+    # Prepare data for plotting
+    metrics_long = pd.melt(
+        metrics_df,
+        id_vars=['country', 'year'],
+        value_vars=['palma', 'ratio_top20bottom20', 'upper_middle_to_lower'],
+        var_name='metric',
+        value_name='value'
+    )
+
+    # Create nicer labels for metrics
+    metrics_long['metric'] = metrics_long['metric'].map({
+        'palma': 'Palma Ratio',
+        'ratio_top20bottom20': 'Top20/Bottom20 Ratio',
+        'upper_middle_to_lower': 'Upper/Lower Middle Ratio'
+    })
+    return metrics_long
@@ -0,0 +1,98 @@
+"""Population-weighted regional and income-group rollups of any indicator.
+
+Countries are mapped to World Bank regions and income groups (FY2024
+classification) in data/country_groups.csv. A rollup is the mean of an indicator
+over a group's countries, weighted by their population (SP.POP.TOTL), so it only
+exists for the years the population series covers.
+"""
+import numpy as np
+import pandas as pd
+
+from inequality_data.store import DATA_DIR
+
+COUNTRY_GROUPS_FILENAME = 'country_groups.csv'
+POPULATION_CODE = 'SP.POP.TOTL'
+
+# Grouping column in country_groups.csv -> prefix of the rollup names shown in the multiselects
+GROUPINGS = {
+    'Region': 'Region',
+    'Income Group': 'Income',
+}
+
+# A group-year is only reported when the countries with data hold at least this
+# share of the group's population
+MIN_COVERAGE = 0.5
+
+
+def read_country_groups():
+    """Country Code -> Region and Income Group. Unclassified countries have a blank group."""
+    return pd.read_csv(DATA_DIR/COUNTRY_GROUPS_FILENAME, keep_default_na=False)
+
+
+def aggregate_mask(df, country_groups):
+    """True for the rows of World Bank aggregates (regions, income groups, World, ...)."""
+    return ~df['Country Code'].isin(country_groups['Country Code']).to_numpy()
+
+
+def rollup_name(grouping, group):
+    return f'{GROUPINGS[grouping]}: {group}'
+
+
+def to_panel(long_df, value_col, countries, years):
+    """Country x year array of one value column, NaN where the long frame has no row."""
+    return (
+        long_df.drop_duplicates(['Country Code', 'Year'])
+        .pivot(index='Country Code', columns='Year', values=value_col)
+        .reindex(index=countries, columns=years)
+        .to_numpy(dtype=float)
+    )
+
+
+def weighted_rollup(values_df, value_col, population_df, country_groups, grouping, min_coverage=MIN_COVERAGE):
+    """Population-weighted mean of value_col for every group of `grouping` and year.
+
+    values_df and population_df are long frames with 'Country Code' and 'Year'
+    columns (population in 'Value'). Returns a long frame shaped like the country
+    frames, with the group as 'Country Name' and the share of the group's
+    population that has data as 'Coverage'.
+    """
+    groups = country_groups.set_index('Country Code')[grouping]
+    groups = groups[groups != '']
+    countries = groups.index
+    years = sorted(set(values_df['Year']) & set(population_df['Year']))
+
+    values = to_panel(values_df, value_col, countries, years)
+    population = to_panel(population_df, 'Value', countries, years)
+
+    # One-hot group x country matrix, so every group sum is a single matrix product
+    group_codes, group_names = pd.factorize(groups.to_numpy())
+    membership = np.zeros((len(group_names), len(countries)))
+    membership[group_codes, np.arange(len(countries))] = 1.0
+
+    has_data = ~np.isnan(values) & ~np.isnan(population)
+    weights = np.where(has_data, population, 0.0)
+    weighted_sum = membership @ np.where(has_data, values * population, 0.0)
+    weight_total = membership @ weights
+    population_total = membership @ np.nan_to_num(population)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = weighted_sum / weight_total
+        coverage = weight_total / population_total
+
+    rollup_df = pd.DataFrame({
+        'Country Name': np.repeat([rollup_name(grouping, group) for group in group_names], len(years)),
+        'Country Code': np.repeat([f'{grouping}:{group}' for group in group_names], len(years)),
+        'Year': np.tile(np.asarray(years, dtype=int), len(group_names)),
+        value_col: mean.ravel(),
+        'Coverage': coverage.ravel(),
+    })
+    return rollup_df[rollup_df['Coverage'].fillna(0) >= min_coverage].reset_index(drop=True)
+
+
+def group_members(df, country_groups, grouping):
+    """{group: [country names in df]} for every group of `grouping`."""
+    codes = country_groups.set_index('Country Code')[grouping]
+    names = df[['Country Code', 'Country Name']].drop_duplicates('Country Code')
+    names = names.assign(Group=names['Country Code'].map(codes)).dropna(subset=['Group'])
+    names = names[names['Group'] != '']
+    return {group: sorted(members['Country Name']) for group, members in names.groupby('Group')}
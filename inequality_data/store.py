@@ -0,0 +1,262 @@
+"""Indicator data store under data/ with per-series versions.
+
+Refresh the store from a new World Bank / WIID bulk download with
+
+    python -m inequality_data.store <csv file | directory | http(s) URL> [...]
+
+Only the cells that changed, keyed by (series, country, year), are rewritten, and
+the version of every affected series is bumped in data/versions.json. The loaders
+key their caches on these versions, so running sessions pick up the new data on
+their next rerun and only the affected series are recomputed.
+"""
+import argparse
+import io
+import json
+import os
+import re
+import tempfile
+import urllib.request
+from pathlib import Path
+
+import pandas as pd
+
+DATA_DIR = Path(__file__).parent.parent/'data'
+VERSIONS_FILENAME = 'versions.json'
+
+# Store files and the layout each one is kept in
+STORE_FILES = {
+    'world_bank_popular_indicators.csv': 'databank',
+    'gini_data.csv': 'wdi',
+    'poverty_headcount_ratio_data.csv': 'wdi',
+}
+
+# (series key, country key) columns and missing-value marker of each layout:
+# 'databank' is the DataBank export, 'wdi' the data.worldbank.org indicator download
+LAYOUTS = {
+    'databank': (['Series Code', 'Country Code'], '..'),
+    'wdi': (['Indicator Code', 'Country Code'], ''),
+}
+# Series code and name columns of each layout; the country columns are the same in both
+SERIES_COLUMNS = {
+    'databank': ('Series Code', 'Series Name'),
+    'wdi': ('Indicator Code', 'Indicator Name'),
+}
+
+# WIID is a long file with several surveys per country-year, so it is versioned as a whole
+WIID_FILENAME = 'WIID_data.csv'
+WIID_SERIES = 'WIID'
+
+YEAR_COLUMN = re.compile(r'^(\d{4})(?: \[YR\d{4}\])?$')
+
+_versions_cache = {}
+
+
+def read_versions():
+    """Return the {series code: version} mapping. Series never refreshed are at version 0."""
+    path = DATA_DIR/VERSIONS_FILENAME
+    if not path.exists():
+        return {}
+    mtime = path.stat().st_mtime_ns
+    if _versions_cache.get('mtime') != mtime:
+        _versions_cache['versions'] = json.loads(path.read_text())
+        _versions_cache['mtime'] = mtime
+    return _versions_cache['versions']
+
+
+def series_version(code):
+    """Current version of a series, used as a cache key by the loaders."""
+    return read_versions().get(code, 0)
+
+
+def file_revision(filename):
+    """Cache key for a raw store file; it changes whenever the file is rewritten."""
+    path = DATA_DIR/filename
+    return path.stat().st_mtime_ns if path.exists() else None
+
+
+def detect_layout(raw_df):
+    """Tell which bulk-file layout a raw frame is in."""
+    if 'Series Code' in raw_df.columns:
+        return 'databank'
+    if 'Indicator Code' in raw_df.columns:
+        return 'wdi'
+    if {'country', 'year', 'gini'} <= set(raw_df.columns):
+        return 'wiid'
+    raise ValueError(f"Unrecognised bulk file layout (columns: {', '.join(raw_df.columns[:6])}, ...)")
+
+
+def year_columns(raw_df):
+    """Map the year columns of a wide frame to their year, e.g. '2000 [YR2000]' -> 2000."""
+    return {col: int(match.group(1)) for col in raw_df.columns if (match := YEAR_COLUMN.match(col))}
+
+
+def to_long(raw_df, layout):
+    """Melt a wide frame of strings into one row per (series, country, year) cell."""
+    keys, _ = LAYOUTS[layout]
+    years = year_columns(raw_df)
+    long_df = raw_df.melt(id_vars=keys, value_vars=list(years), var_name='Column', value_name='Text')
+    long_df = long_df.rename(columns={keys[0]: 'Series Code'})
+    long_df['Year'] = long_df['Column'].map(years)
+    long_df['Value'] = pd.to_numeric(long_df['Text'], errors='coerce')
+    return long_df.drop(columns='Column')
+
+
+def convert_layout(raw_df, layout, new_layout):
+    """Rename the series columns of a wide frame from one layout to another."""
+    return raw_df.rename(columns=dict(zip(SERIES_COLUMNS[layout], SERIES_COLUMNS[new_layout])))
+
+
+def read_csv_text(source):
+    """Read a CSV as strings so that unchanged cells are written back byte for byte."""
+    if isinstance(source, bytes):
+        text = source.decode('utf-8-sig')
+    else:
+        text = Path(source).read_text(encoding='utf-8-sig')
+    # data.worldbank.org bulk downloads start with four lines of metadata
+    skiprows = 4 if text.startswith('"Data Source"') else 0
+    return pd.read_csv(io.StringIO(text), dtype=str, keep_default_na=False, skiprows=skiprows)
+
+
+def read_bulk(source):
+    """Yield (name, raw frame) for every CSV in a file, a directory or at an http(s) URL."""
+    if re.match(r'https?://', source):
+        with urllib.request.urlopen(source) as response:
+            yield source, read_csv_text(response.read())
+        return
+    path = Path(source)
+    for csv_path in sorted(path.glob('*.csv')) if path.is_dir() else [path]:
+        yield str(csv_path), read_csv_text(csv_path)
+
+
+def diff_cells(current_long, new_long):
+    """Return the cells of new_long whose value differs from the one in current_long."""
+    merged = new_long.merge(
+        current_long[['Series Code', 'Country Code', 'Year', 'Value']],
+        on=['Series Code', 'Country Code', 'Year'],
+        how='left',
+        suffixes=('', ' Current'),
+    )
+    both_missing = merged['Value'].isna() & merged['Value Current'].isna()
+    changed = ~both_missing & (merged['Value'] != merged['Value Current'])
+    return merged[changed].drop(columns='Value Current')
+
+
+def write_store_file(store_df, path):
+    """Atomically replace a store file, keeping its CRLF line endings and trailing commas."""
+    store_df = store_df.rename(columns=lambda col: '' if col.startswith('Unnamed:') else col)
+    text = store_df.to_csv(index=False, lineterminator='\r\n').rstrip('\r\n')
+    with tempfile.NamedTemporaryFile('w', dir=path.parent, suffix='.tmp', delete=False, newline='') as tmp:
+        tmp.write(text)
+    os.replace(tmp.name, path)
+
+
+def apply_cells(store_df, changed, new_raw_df, layout):
+    """Write the changed cells into the raw store frame, adding rows and years it lacks."""
+    keys, missing = LAYOUTS[layout]
+    changed = changed.rename(columns={'Series Code': keys[0]})
+    columns_by_year = {year: col for col, year in year_columns(store_df).items()}
+
+    # Years the store has not seen yet go after its last year column
+    for year in sorted(set(changed['Year']) - set(columns_by_year)):
+        col = f'{year} [YR{year}]' if layout == 'databank' else str(year)
+        position = store_df.columns.get_loc(list(columns_by_year.values())[-1]) + 1
+        store_df.insert(position, col, missing)
+        columns_by_year[year] = col
+
+    # Countries the store has not seen yet for a series get a new row
+    store_index = pd.MultiIndex.from_frame(store_df[keys])
+    changed_index = pd.MultiIndex.from_frame(changed[keys]).unique()
+    new_pairs = changed_index.difference(store_index)
+    if len(new_pairs):
+        id_columns = [col for col in store_df.columns if col in new_raw_df.columns and col not in year_columns(store_df)]
+        new_rows = new_raw_df.drop_duplicates(keys).set_index(keys, drop=False).loc[new_pairs, id_columns]
+        new_rows = new_rows.reindex(columns=store_df.columns, fill_value=missing)
+        store_df = pd.concat([store_df, new_rows.reset_index(drop=True)], ignore_index=True)
+
+    store_df = store_df.set_index(keys, drop=False)
+    for year, cells in changed.groupby('Year'):
+        texts = cells['Text'].where(cells['Value'].notna(), missing)
+        store_df.loc[list(zip(cells[keys[0]], cells[keys[1]])), columns_by_year[year]] = texts.to_numpy()
+    return store_df.reset_index(drop=True)
+
+
+def refresh_wiid(new_raw_df):
+    """Replace the WIID file if its contents changed; return the number of changed rows."""
+    path = DATA_DIR/WIID_FILENAME
+    current = read_csv_text(path) if path.exists() else pd.DataFrame(columns=new_raw_df.columns)
+    if current.equals(new_raw_df):
+        return 0
+    changed_rows = len(pd.concat([current, new_raw_df]).drop_duplicates(keep=False))
+    write_store_file(new_raw_df, path)
+    return changed_rows
+
+
+def refresh(new_raw_df):
+    """Apply one bulk file to the store.
+
+    Returns ({series code: number of changed cells}, [series codes no store file holds]).
+    A series is updated in whichever store file holds it, whatever the layout of
+    either file, so that e.g. the Gini index of a DataBank export reaches gini_data.csv.
+    """
+    layout = detect_layout(new_raw_df)
+    if layout == 'wiid':
+        changed_rows = refresh_wiid(new_raw_df)
+        return ({WIID_SERIES: changed_rows} if changed_rows else {}), []
+
+    new_long = to_long(new_raw_df, layout)
+    changes = {}
+    stored_series = set()
+    for filename, store_layout in STORE_FILES.items():
+        path = DATA_DIR/filename
+        store_df = read_csv_text(path)
+        store_keys, _ = LAYOUTS[store_layout]
+        store_series = set(store_df[store_keys[0]])
+        stored_series |= store_series
+
+        changed = diff_cells(to_long(store_df, store_layout), new_long[new_long['Series Code'].isin(store_series)])
+        if changed.empty:
+            continue
+        new_store_df = apply_cells(store_df, changed, convert_layout(new_raw_df, layout, store_layout), store_layout)
+        write_store_file(new_store_df, path)
+        changes.update(changed['Series Code'].value_counts().to_dict())
+
+    unknown = sorted(set(new_long['Series Code']) - stored_series)
+    return changes, unknown
+
+
+def bump_versions(codes):
+    """Increase the version of each series and save the mapping atomically."""
+    versions = dict(read_versions())
+    for code in codes:
+        versions[code] = versions.get(code, 0) + 1
+    path = DATA_DIR/VERSIONS_FILENAME
+    with tempfile.NamedTemporaryFile('w', dir=path.parent, suffix='.tmp', delete=False) as tmp:
+        json.dump(versions, tmp, indent=2, sort_keys=True)
+    os.replace(tmp.name, path)
+    return versions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply World Bank / WIID bulk files to the dashboard data store.')
+    parser.add_argument('sources', nargs='+', help='CSV file, directory of CSV files or http(s) URL')
+    args = parser.parse_args(argv)
+
+    all_changes = {}
+    for source in args.sources:
+        for name, raw_df in read_bulk(source):
+            changes, unknown = refresh(raw_df)
+            for code, count in changes.items():
+                all_changes[code] = all_changes.get(code, 0) + count
+            if unknown:
+                print(f"{name}: skipped series not held by any store file: {', '.join(unknown)}")
+
+    if not all_changes:
+        print('Data store is up to date.')
+        return
+    versions = bump_versions(all_changes)
+    for code, count in sorted(all_changes.items()):
+        print(f'{code}: {count} changed cells, now at version {versions[code]}')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Change, growth, trend and volatility of every country of a series at once.
+
+The long frame is pivoted to a country x year array with NaN for missing years, and
+every statistic is computed over the whole array, so ranking all countries costs
+the same as describing one.
+"""
+import numpy as np
+import pandas as pd
+
+from inequality_data.rollups import to_panel
+
+# Statistic column -> label shown in the leaderboard
+STATISTICS = {
+    'Change': 'Change',
+    'CAGR': 'Compound annual growth rate',
+    'Slope': 'Linear trend (per year)',
+    'Volatility': 'Volatility around the trend',
+}
+
+
+def trend_stats(long_df, value_col, from_year, to_year):
+    """One row per country with at least two observations between from_year and to_year.
+
+    Change and CAGR compare the first and last observed values of the range (CAGR
+    only when both are positive), Slope is the least-squares trend per year and
+    Volatility the standard deviation of the observations around that trend (it
+    needs three observations). Flag columns ('Aggregate', 'Rollup') are carried over.
+    """
+    long_df = long_df[(long_df['Year'] >= from_year) & (long_df['Year'] <= to_year)]
+    names = long_df.drop_duplicates('Country Code').set_index('Country Code')
+    countries = names.index
+    years = np.arange(from_year, to_year + 1)
+    values = to_panel(long_df, value_col, countries, years)
+
+    observed = ~np.isnan(values)
+    n = observed.sum(axis=1)
+    rows = np.arange(len(countries))
+    first_idx = observed.argmax(axis=1)
+    last_idx = len(years) - 1 - observed[:, ::-1].argmax(axis=1)
+    first_value = values[rows, first_idx]
+    last_value = values[rows, last_idx]
+    first_year = years[first_idx]
+    last_year = years[last_idx]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cagr = np.where(
+            (first_value > 0) & (last_value > 0),
+            (last_value / first_value) ** (1 / (last_year - first_year)) - 1,
+            np.nan
+        )
+
+        # Least-squares slope over the observed points only
+        x = np.where(observed, years, np.nan)
+        dx = x - (np.nansum(x, axis=1) / n)[:, None]
+        dy = values - (np.nansum(values, axis=1) / n)[:, None]
+        slope = np.nansum(dx * dy, axis=1) / np.nansum(dx ** 2, axis=1)
+        residuals = dy - slope[:, None] * dx
+        volatility = np.where(n >= 3, np.sqrt(np.nansum(residuals ** 2, axis=1) / (n - 2)), np.nan)
+
+    stats_df = pd.DataFrame({
+        'Country Name': names['Country Name'].to_numpy(),
+        'Country Code': countries,
+        'First Year': first_year,
+        'First Value': first_value,
+        'Last Year': last_year,
+        'Last Value': last_value,
+        'Change': last_value - first_value,
+        'CAGR': cagr,
+        'Slope': slope,
+        'Volatility': volatility,
+        'Observations': n,
+    })
+    for col in ('Aggregate', 'Rollup'):
+        if col in names:
+            stats_df[col] = names[col].to_numpy()
+    return stats_df[n >= 2].reset_index(drop=True)
+
+
+def movers(stats_df, statistic, count, exclude=()):
+    """(top, bottom) `count` rows by `statistic`, skipping rows flagged in `exclude`."""
+    for flag in exclude:
+        if flag in stats_df:
+            stats_df = stats_df[~stats_df[flag]]
+    ranked = stats_df.dropna(subset=[statistic])
+    return ranked.nlargest(count, statistic), ranked.nsmallest(count, statistic)
@@ -0,0 +1,350 @@
+"""Chart builders shared by the Interactive Data page and the snapshot exporter.
+
+Each builder takes an already filtered frame and returns an Altair chart or a
+Plotly figure without calling Streamlit, so the same charts can be rendered
+outside a session.
+"""
+import altair as alt
+import plotly.graph_objects as go
+
+
+def gdp_deflator_line_chart(filtered_gdp_deflator_df):
+    return alt.Chart(filtered_gdp_deflator_df).mark_line().encode(
+        x=alt.X('Year:O', title='Year', axis=alt.Axis(format='d')),
+        y=alt.Y('GDP Deflator:Q',
+                title='GDP Deflator (%)',
+                axis=alt.Axis(format='d', tickCount=5)),  # Show integers instead of floats
+        color='Country Name:N',
+        tooltip=['Country Name', 'Year', 'GDP Deflator']
+    ).properties(
+        title='GDP Deflator over time'
+    )
+
+
+def gdp_deflator_map(gdp_deflator_df, selected_year, selected_countries):
+    """Choropleth of the GDP deflator in one year; unselected countries are drawn at 0."""
+    # Base frame with every country code, filled in with the selected countries' values
+    base_df = gdp_deflator_df[['Country Code', 'Country Name']].drop_duplicates('Country Code')
+    year_df = gdp_deflator_df[
+        (gdp_deflator_df['Year'] == selected_year) &
+        (gdp_deflator_df['Country Name'].isin(selected_countries))
+    ]
+    year_values = year_df.drop_duplicates('Country Code').set_index('Country Code')['GDP Deflator']
+    base_df = base_df.assign(**{'GDP Deflator': base_df['Country Code'].map(year_values).fillna(0.0)})
+
+    world_map = go.Figure(data=go.Choropleth(
+        locations=base_df['Country Code'],
+        z=base_df['GDP Deflator'],
+        text=base_df['Country Name'],
+        # Use colorblind-friendly diverging colorscale centered at 0
+        colorscale='RdBu',  # Red-Blue diverging colorscale that works well for colorblind viewers
+        zmid=0,  # Center the color scale at 0
+        autocolorscale=False,
+        reversescale=True,  # Makes blue represent positive values, red negative
+        marker_line_color='darkgray',
+        marker_line_width=0.5,
+        colorbar_title="GDP Deflator (%)"
+    ))
+
+    # Update the layout for the map
+    world_map.update_layout(
+        title_text=f'GDP Deflator in {selected_year}',
+        geo=dict(
+            showframe=False,
+            showcoastlines=False,
+            projection_type='equirectangular'
+        ),
+        annotations=[dict(
+            x=0.5,
+            y=-0.1,
+            xref='paper',
+            yref='paper',
+            text='Source: World Inequality Database',
+            showarrow=False
+        )]
+    )
+    return world_map
+
+
+def indicator_line_chart(filtered_indicator_df, selected_series):
+    return alt.Chart(filtered_indicator_df).mark_line().encode(
+        x=alt.X('Year:O', title='Year', axis=alt.Axis(format='d', grid=True)),
+        y=alt.Y('Value:Q', title=selected_series, axis=alt.Axis(format=',.0f', tickCount=5, grid=True)),
+        color='Country Name:N',
+        tooltip=['Country Name', 'Year', 'Value']
+    ).properties(
+        title=f'{selected_series} over Time'
+    ).configure_axis(
+        gridDash=[5,5],
+        gridOpacity=0.5
+    )
+
+
+def with_imputed_points(line_chart, df):
+    """Mark the rows flagged as 'Imputed' (see inequality_data.gapfill) with hollow points."""
+    if 'Imputed' not in df or not df['Imputed'].any():
+        return line_chart
+    return line_chart + line_chart.mark_point(filled=False, size=40).transform_filter('datum.Imputed')
+
+
+def gini_line_chart(filtered_gini_df):
+    return with_imputed_points(alt.Chart(filtered_gini_df).mark_line().encode(
+        x=alt.X('Year:O', title='Year', axis=alt.Axis(format='d')),
+        y=alt.Y('GINI:Q', title='GINI', axis=alt.Axis(format=',.0f', tickCount=5)),
+        color='Country Name:N',
+        tooltip=['Country Name', 'Year', 'GINI']
+    ).properties(
+        title='Gini Coefficient over Time'
+    ), filtered_gini_df)
+
+
+def poverty_line_chart(filtered_poverty_df):
+    return with_imputed_points(alt.Chart(filtered_poverty_df).mark_line().encode(
+        x=alt.X('Year:O', title='Year'),
+        y=alt.Y('Poverty Headcount Ratio:Q', title='Headcount Ratio (%)', axis=alt.Axis(format=',.0f', tickCount=5)),
+        color='Country Name:N',
+        tooltip=['Country Name', 'Year', 'Poverty Headcount Ratio']
+    ).properties(
+        title='Poverty Headcount Ratio at $2.15/day (2017 PPP)'
+    ), filtered_poverty_df)
+
+
+def quintile_chart(melted_wiid_df, selected_year):
+    # Stacked bars, one per country, normalized to 100% of income
+    return alt.Chart(melted_wiid_df).mark_bar().encode(
+        x=alt.X('country:N', title='Country'),
+        y=alt.Y(
+            'Income Share:Q',
+            title='Income Share (%)',
+            stack='normalize',
+            axis=alt.Axis(format='.1f')
+        ),
+        color=alt.Color(
+            'Quintile:N',
+            title='Quintile',
+            scale=alt.Scale(scheme='spectral'),
+            sort=['Top 20%', 'Middle (upper) 20%', 'Middle 20%', 'Middle (lower) 20%', 'Bottom 20%']
+        ),
+        order=alt.Order('Quintile:N', sort='ascending'),
+        tooltip=[
+            alt.Tooltip('country:N', title='Country'),
+            alt.Tooltip('Quintile:N', title='Quintile')
+        ]
+    ).properties(
+        title=f'Income Distribution by Quintile ({selected_year})',
+        height=400
+    ).configure_axis(
+        labelFontSize=12,
+        titleFontSize=14
+    ).configure_title(
+        fontSize=16
+    )
+
+
+def inequality_ratios_chart(metrics_long, selected_metric_country):
+    # Lines connecting consecutive years
+    return alt.Chart(metrics_long).mark_line(
+        point=True,
+        strokeWidth=2
+    ).encode(
+        x=alt.X('year:O',
+            title='Year',
+            axis=alt.Axis(labelAngle=0)
+        ),
+        y=alt.Y('value:Q',
+            title='Ratio Value',
+            scale=alt.Scale(zero=False)
+        ),
+        color=alt.Color('metric:N',
+            title='Ratio Type',
+            legend=alt.Legend(
+            orient='top',
+            titleFontSize=12,
+            labelFontSize=11
+            )
+        ),
+        tooltip=['country:N', 'year:O', 'metric:N',
+            alt.Tooltip('value:Q', format='.2f')]
+    ).properties(
+        title=f'Inequality Metrics Over Time for {selected_metric_country}',
+        height=400
+    ).interactive()
+
+
+def animated_choropleth(long_df, value_col, title, colorbar_title, colorscale='RdBu', reversescale=True, zmid=None, decimals=1):
+    """Choropleth with one animation frame per year, scrubbed in the browser without reruns.
+
+    Frames only carry the countries with data in that year, with values rounded to
+    `decimals`, to keep the figure small. Returns None when there is nothing to draw.
+    """
+    long_df = long_df.dropna(subset=[value_col])
+    if long_df.empty:
+        return None
+    long_df = long_df.assign(**{value_col: long_df[value_col].round(decimals)})
+
+    # Fixed color range for every frame, ignoring the most extreme outliers
+    zmin, zmax = long_df[value_col].quantile([0.02, 0.98]).round(decimals)
+    if zmid is not None:
+        half_range = max(abs(zmin - zmid), abs(zmax - zmid))
+        zmin, zmax = zmid - half_range, zmid + half_range
+
+    traces = {
+        int(year): go.Choropleth(
+            locations=group['Country Code'].tolist(),
+            z=group[value_col].tolist(),
+        )
+        for year, group in long_df.groupby('Year')
+    }
+    years = list(traces)
+
+    world_map = go.Figure(
+        data=[traces[years[0]]],
+        frames=[go.Frame(data=[trace], name=str(year)) for year, trace in traces.items()],
+    )
+    world_map.update_traces(
+        colorscale=colorscale,
+        reversescale=reversescale,
+        zmin=zmin,
+        zmax=zmax,
+        autocolorscale=False,
+        marker_line_color='darkgray',
+        marker_line_width=0.5,
+        colorbar_title=colorbar_title,
+    )
+
+    # Geo traces have to be redrawn on every frame
+    frame_args = dict(frame=dict(duration=500, redraw=True), transition=dict(duration=0), mode='immediate')
+    world_map.update_layout(
+        title_text=title,
+        geo=dict(
+            showframe=False,
+            showcoastlines=False,
+            projection_type='equirectangular'
+        ),
+        updatemenus=[dict(
+            type='buttons',
+            showactive=False,
+            x=0.05,
+            y=0,
+            xanchor='right',
+            yanchor='top',
+            buttons=[
+                dict(label='▶', method='animate', args=[None, dict(frame_args, fromcurrent=True)]),
+                dict(label='❚❚', method='animate', args=[[None], dict(frame_args, frame=dict(duration=0, redraw=False))]),
+            ],
+        )],
+        sliders=[dict(
+            x=0.1,
+            len=0.9,
+            y=0,
+            currentvalue=dict(prefix='Year: '),
+            steps=[
+                dict(label=str(year), method='animate', args=[[str(year)], frame_args])
+                for year in years
+            ],
+        )],
+    )
+    return world_map
+
+
+def movers_chart(movers_df, statistic, statistic_label):
+    """Horizontal bars of the countries with the largest and smallest `statistic`."""
+    return alt.Chart(movers_df).mark_bar().encode(
+        x=alt.X(f'{statistic}:Q', title=statistic_label),
+        y=alt.Y('Country Name:N', sort='-x', title=None),
+        # Rises in red, falls in blue
+        color=alt.condition(alt.datum[statistic] > 0, alt.value('#d6604d'), alt.value('#4393c3')),
+        tooltip=[
+            'Country Name',
+            'First Year',
+            'Last Year',
+            alt.Tooltip('First Value:Q', format=',.2f'),
+            alt.Tooltip('Last Value:Q', format=',.2f'),
+            alt.Tooltip(f'{statistic}:Q', format=',.3f'),
+        ]
+    ).properties(
+        title=f'Biggest movers: {statistic_label}'
+    )
+
+
+def band_chart(bands_df, highlight_df, value_col, title, y_title):
+    """Median and 10-90th / 25-75th percentile bands by year, with a few highlighted countries as lines.
+
+    bands_df comes from inequality_data.get_percentile_bands; its size depends only
+    on the number of years, however many countries it summarizes.
+    """
+    base = alt.Chart(bands_df).encode(x=alt.X('Year:O', title='Year', axis=alt.Axis(format='d')))
+    outer_band = base.mark_area(opacity=0.2, color='#4c78a8').encode(
+        y=alt.Y('p10:Q', title=y_title),
+        y2='p90:Q'
+    )
+    inner_band = base.mark_area(opacity=0.35, color='#4c78a8').encode(y='p25:Q', y2='p75:Q')
+    median = base.mark_line(color='#1f3b73', strokeWidth=2).encode(
+        y='p50:Q',
+        tooltip=[
+            'Year',
+            alt.Tooltip('p50:Q', title='Median', format=',.2f'),
+            alt.Tooltip('p25:Q', title='25th percentile', format=',.2f'),
+            alt.Tooltip('p75:Q', title='75th percentile', format=',.2f'),
+            alt.Tooltip('Countries:Q', title='Countries with data'),
+        ]
+    )
+    highlights = alt.Chart(highlight_df).mark_line(point=True).encode(
+        x='Year:O',
+        y=f'{value_col}:Q',
+        color='Country Name:N',
+        tooltip=['Country Name', 'Year', value_col]
+    )
+    return alt.layer(outer_band, inner_band, median, highlights).properties(title=title)
+
+
+def indicator_scatter_chart(scatter_df, x_title, y_title, year, log_x=False, log_y=False):
+    """One bubble per country: X against Y, sized by Population and coloured by region.
+
+    Vega-Lite drops rows with a null in a scaled field, so countries without
+    population data get the smallest bubble, and in years without any the bubbles
+    all have the same size.
+    """
+    encodings = {}
+    if scatter_df['Population'].notna().any():
+        scatter_df = scatter_df.assign(Size=scatter_df['Population'].fillna(scatter_df['Population'].min()))
+        encodings = {
+            'size': alt.Size('Size:Q', scale=alt.Scale(range=[15, 2500]), legend=None),
+            'order': alt.Order('Size:Q', sort='descending'),  # Small countries drawn on top
+        }
+    return alt.Chart(scatter_df).mark_circle(opacity=0.7, stroke='white', strokeWidth=0.5).encode(
+        x=alt.X('X:Q', title=x_title, scale=alt.Scale(type='log' if log_x else 'linear', zero=False)),
+        y=alt.Y('Y:Q', title=y_title, scale=alt.Scale(type='log' if log_y else 'linear', zero=False)),
+        color=alt.Color('Region:N', legend=alt.Legend(orient='bottom', columns=2)),
+        tooltip=[
+            'Country Name',
+            'Region',
+            alt.Tooltip('X:Q', title=x_title, format=',.2f'),
+            alt.Tooltip('Y:Q', title=y_title, format=',.2f'),
+            alt.Tooltip('Population:Q', format=',.0f'),
+        ],
+        **encodings
+    ).properties(
+        title=f'{y_title} vs. {x_title}, {year}',
+        height=500
+    )
+
+
+def correlation_heatmap(corr_df, year):
+    """Series x series matrix of correlations across countries, from -1 (blue) to 1 (red)."""
+    series_order = list(dict.fromkeys(corr_df['X']))
+    return alt.Chart(corr_df).mark_rect().encode(
+        x=alt.X('X:N', sort=series_order, title=None, axis=alt.Axis(labelLimit=160, labelAngle=-60)),
+        y=alt.Y('Y:N', sort=series_order, title=None, axis=alt.Axis(labelLimit=160)),
+        color=alt.Color('Correlation:Q', scale=alt.Scale(scheme='redblue', domain=[-1, 1], reverse=True)),
+        tooltip=[
+            alt.Tooltip('X:N', title='Series'),
+            alt.Tooltip('Y:N', title='and'),
+            alt.Tooltip('Correlation:Q', format='.2f'),
+            alt.Tooltip('Countries:Q', title='Countries compared'),
+        ]
+    ).properties(
+        title=f'Correlations across countries, {year}',
+        width=alt.Step(13),
+        height=alt.Step(13)
+    )
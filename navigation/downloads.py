@@ -0,0 +1,54 @@
+"""Download buttons for the data behind the Interactive Data page's charts.
+
+serve.py mounts the query API under api/, and there the buttons link to its
+/export route: the file is streamed from the cached series one series at a
+time, in the server's threadpool, so neither the script run nor memory grows
+with the size of the download. Under `streamlit run streamlit_app.py` there is
+no such route, and the buttons build the file in memory when clicked instead,
+with the same encoders (see inequality_data.export).
+"""
+from urllib.parse import urlencode
+
+import streamlit as st
+
+from inequality_data import api, export
+
+# URL of the /export route relative to the page; set by serve.py when it mounts the query API
+EXPORT_URL = None
+
+
+def is_streaming():
+    """Whether downloads are streamed by the query API, rather than built in memory."""
+    return EXPORT_URL is not None
+
+
+def country_codes(series_df, names):
+    """Codes of the countries and rollups named `names`, as the query API takes them."""
+    codes = series_df.drop_duplicates('Country Name').set_index('Country Name')['Country Code']
+    return codes.reindex(names).dropna().tolist()
+
+
+def export_url(codes, countries, from_year, to_year, fmt):
+    params = {'series': ','.join(codes), 'countries': ','.join(countries), 'from': from_year, 'to': to_year, 'format': fmt}
+    # Commas and colons left as they are keep long country lists readable
+    return EXPORT_URL + '?' + urlencode({name: value for name, value in params.items() if value not in ('', None)}, safe=',:')
+
+
+def download_buttons(codes, countries, from_year, to_year, key):
+    """CSV and Parquet downloads of series `codes` for country codes `countries` (every country if empty) in the years."""
+    filename = codes[0] if len(codes) == 1 else 'inequality-data'
+    with st.container(horizontal=True):
+        for fmt, mime in export.FORMATS.items():
+            label = f'Download {fmt.upper() if fmt == "csv" else fmt.title()}'
+            if is_streaming():
+                st.link_button(label, export_url(codes, countries, from_year, to_year, fmt), icon=':material/download:')
+            else:
+                st.download_button(
+                    label,
+                    data=lambda fmt=fmt: b''.join(export.iter_export(api.export_tables(codes, countries, from_year, to_year), fmt)),
+                    file_name=f'{filename}.{fmt}',
+                    mime=mime,
+                    key=f'{key}_{fmt}',
+                    on_click='ignore',
+                    icon=':material/download:'
+                )
@@ -1,101 +1,77 @@
 import streamlit as st
-import pandas as pd
 import math
-import altair as alt
-from pathlib import Path
-import plotly.graph_objects as go
-
-# Cache decorators for each data loading function
-@st.cache_data
-def get_gdp_data():
-    """Grab GDP deflator data from the world_bank_popular_indicators dataset."""
-    DATA_FILENAME = Path(__file__).parent.parent/'data/world_bank_popular_indicators.csv'
-    raw_gdp_df = pd.read_csv(DATA_FILENAME)
-
-    MIN_YEAR = 2000
-    MAX_YEAR = 2015
-
-    # Filter the dataset for the specific Series Code
-    gdp_deflator_df = raw_gdp_df[raw_gdp_df['Series Code'] == 'NY.GDP.DEFL.KD.ZG']
-
-    # Melt the dataset into long format
-    gdp_deflator_df = gdp_deflator_df.melt(
-        id_vars=['Country Name', 'Country Code', 'Series Name', 'Series Code'],
-        var_name='Year',
-        value_name='GDP Deflator'
-    )
-
-    # Convert Year to numeric and drop rows with missing GDP Deflator values
-    gdp_deflator_df['Year'] = gdp_deflator_df['Year'].str.extract('(\d{4})').astype(int)
-    gdp_deflator_df = gdp_deflator_df.dropna(subset=['GDP Deflator'])
-
-    return gdp_deflator_df
-
-@st.cache_data
-def get_gini_data():
-    """Grab Gini data from a CSV file."""
-    DATA_FILENAME = Path(__file__).parent.parent/'data/gini_data.csv'
-    raw_gini_df = pd.read_csv(DATA_FILENAME)
-
-    MIN_YEAR = 1960
-    MAX_YEAR = 2023
-
-    gini_df = raw_gini_df.melt(
-        ['Country Name','Country Code'],
-        [str(x) for x in range(MIN_YEAR, MAX_YEAR + 1)],
-        'Year',
-        'GINI',
-    )
-
-    # Convert years from string to integers
-    gini_df['Year'] = pd.to_numeric(gini_df['Year'])
-
-    return gini_df
+from inequality_data import (
+    GDP_DEFLATOR_CODE,
+    GINI_CODE,
+    POVERTY_CODE,
+    filter_series,
+    get_coverage,
+    get_filled_series,
+    get_gdp_data,
+    get_indicator_names,
+    get_indicator_panel,
+    get_inequality_ratios,
+    get_quintile_shares,
+    get_series_with_rollups,
+    get_wiid_coverage,
+    get_wiid_data,
+)
+from inequality_data.crosssection import MIN_COUNTRIES
+from inequality_data.gapfill import MAX_GAP
+from inequality_data.rollups import POPULATION_CODE
+from inequality_data.store import DATA_DIR, WIID_FILENAME, WIID_SERIES
+from inequality_data.trends import STATISTICS
+from navigation import charts, payload
+from navigation.downloads import country_codes, download_buttons, is_streaming
+from navigation.views import (
+    MOVERS_COLUMNS,
+    cached_view,
+    correlation_view,
+    correlation_years,
+    movers_view,
+    panel_series,
+    scatter_view,
+    survey_map,
+)
+
+# Shown under every country selector that also lists the regional and income-group rollups
+ROLLUP_CAPTION = "Entries starting with *Region:* or *Income:* are population-weighted averages of the countries with data, shown for the years where those countries hold at least half of the group's population."
+
+# Every filter below has a key and bind='query-params', so the URL holds the whole view;
+# the keys are the parameter names and must stay stable for shared links to keep working.
+
+def reset_if_out_of_range(key, min_value, max_value):
+    """Forget a range slider's value once its bounds no longer contain it, so it goes back to its default.
+
+    Keyed widgets keep their value when another filter changes their bounds (e.g. a
+    new indicator), and a slider raises on a value outside them.
+    """
+    if key in st.session_state and not all(min_value <= value <= max_value for value in st.session_state[key]):
+        del st.session_state[key]
+
+def line_or_band_chart(series_df, series_code, value_col, selected_countries, from_year, to_year, line_chart, title, y_title, key, filled=False):
+    """One line per selected country, or percentile bands plus a few highlighted countries once there are too many."""
+    highlighted = []
+    if len(selected_countries) > payload.MAX_SERIES:
+        highlighted = st.multiselect(
+            'Highlight countries',
+            selected_countries,
+            selected_countries[:3],
+            max_selections=5,
+            key=key,
+            bind='query-params'
+        )
+        st.caption(f"With more than {payload.MAX_SERIES} countries selected, the chart shows their median and the 25-75th and 10-90th percentile bands for each year.")
 
-@st.cache_data
-def get_poverty_data():
-    """Grab Poverty Headcount Ratio data from a CSV file."""
-    DATA_FILENAME = Path(__file__).parent.parent/'data/poverty_headcount_ratio_data.csv'
-    raw_poverty_df = pd.read_csv(DATA_FILENAME)
+    def build(countries, from_year, to_year, highlighted, filled):
+        filtered_df = filter_series(series_df, countries, from_year, to_year)
+        return payload.lines_or_bands(filtered_df, value_col, countries, highlighted, line_chart, title, y_title)
 
-    # Melt the dataset into long format
-    poverty_df = raw_poverty_df.melt(
-        id_vars=['Country Name', 'Country Code', 'Indicator Name', 'Indicator Code'],
-        var_name='Year',
-        value_name='Poverty Headcount Ratio'
+    return cached_view(
+        title, [series_code], build,
+        countries=selected_countries, from_year=from_year, to_year=to_year, highlighted=highlighted, filled=filled
     )
 
-    # Convert Year to numeric and drop rows with missing Poverty Headcount Ratio values
-    poverty_df['Year'] = pd.to_numeric(poverty_df['Year'], errors='coerce')
-    poverty_df = poverty_df.dropna(subset=['Poverty Headcount Ratio'])
-
-    return poverty_df
-
-def null_perc(df):
-    percent_missing = df.isnull().sum() * 100 / len(df)
-    missing_value_df = pd.DataFrame({'percent_missing': percent_missing})
-    missing_value_df.sort_values('percent_missing', inplace=True, ascending=False)
-    return missing_value_df
-
-@st.cache_data
-def get_wiid_data():
-    """Grab WIID (World Income Inequality Database) data from a CSV file."""
-    DATA_FILENAME = Path(__file__).parent.parent/'data/WIID_data.csv'
-    wiid_df = pd.read_csv(DATA_FILENAME)
-    
-    # Convert numeric columns
-    numeric_columns = ['gini', 'mean', 'median', 'gdp', 'population']
-    for col in numeric_columns:
-        wiid_df[col] = pd.to_numeric(wiid_df[col], errors='coerce')
-    
-    # Convert year to integer
-    wiid_df['year'] = pd.to_numeric(wiid_df['year'], errors='coerce')
-    
-    # Drop rows with missing key values
-    wiid_df = wiid_df.dropna(subset=['country', 'year', 'gini'])
-    
-    return wiid_df
-
 # -----------------#
 # PAGE STARTS HERE
 
@@ -108,6 +84,9 @@ def show_Interactive_Data():
     - [Visualize Your Own Variable](#visualize-your-own-variable)
     - [Gini Coefficient](#gini-coefficient)
     - [Poverty Headcount Ratio](#poverty-headcount-ratio)
+    - [Biggest Movers](#biggest-movers)
+    - [Compare Two Indicators](#compare-two-indicators)
+    - [Download Data](#download-data)
     - [Income Distribution by Quintiles](#income-distribution-by-quintiles)
     - [Income Inequality Ratios](#income-inequality-ratios)
     """)
@@ -149,60 +128,62 @@ def show_Interactive_Data():
     gdp_deflator_df = get_gdp_data()
     st.write(gdp_deflator_df)
     
-    gdp_deflator_df = get_gdp_data()
-
-    # Filter years and countries for GDP deflator data
-    gdp_min_year = gdp_deflator_df['Year'].min()
-    gdp_max_year = gdp_deflator_df['Year'].max()
+    # Years and countries with data, for the widget options
+    gdp_coverage = get_coverage(GDP_DEFLATOR_CODE)
+    gdp_min_year, gdp_max_year = gdp_coverage.year_range()
 
+    reset_if_out_of_range('gdp_years', gdp_min_year, gdp_max_year)
     gdp_from_year, gdp_to_year = st.slider(
         'Which years are you interested in for GDP deflator data?',
         min_value=int(gdp_min_year),  # Convert to integer
         max_value=int(gdp_max_year),  # Convert to integer
         value=[int(gdp_min_year), int(gdp_max_year)],  # Convert default range to integers
-        step=1  # Ensure step is an integer
+        step=1,  # Ensure step is an integer
+        key='gdp_years',
+        bind='query-params'
     )
 
-    gdp_countries = gdp_deflator_df['Country Name'].unique()
+    # Countries followed by regional and income-group rollups
+    gdp_lines_df = get_series_with_rollups(GDP_DEFLATOR_CODE, 'GDP Deflator')
+    gdp_countries = gdp_coverage.countries(gdp_from_year, gdp_to_year)
     selected_gdp_countries = st.multiselect(
         'Which countries would you like to view for GDP deflator data?',
         gdp_countries,
-        ['United States', 'China', 'India']
+        gdp_coverage.available(['United States', 'China', 'India'], gdp_from_year, gdp_to_year),
+        key='gdp_countries',
+        bind='query-params'
     )
+    st.caption(ROLLUP_CAPTION)
 
-    # Filter the GDP Deflator Data
-    filtered_gdp_deflator_df = gdp_deflator_df[
-        (gdp_deflator_df['Country Name'].isin(selected_gdp_countries))
-        & (gdp_deflator_df['Year'] <= gdp_to_year)
-        & (gdp_deflator_df['Year'] >= gdp_from_year)
-    ]
-
-    gdp_deflator_chart = alt.Chart(filtered_gdp_deflator_df).mark_line().encode(
-        x=alt.X('Year:O', title='Year', axis=alt.Axis(format='d')),
-        y=alt.Y('GDP Deflator:Q', 
-                title='GDP Deflator (%)',
-                axis=alt.Axis(format='d', tickCount=5)),  # Show integers instead of floats
-        color='Country Name:N',
-        tooltip=['Country Name', 'Year', 'GDP Deflator']
-    ).properties(
-        title='GDP Deflator over time'
+    # Only the plotted fields, downcast, are sent to the browser
+    gdp_deflator_chart = line_or_band_chart(
+        gdp_lines_df, GDP_DEFLATOR_CODE, 'GDP Deflator', selected_gdp_countries, gdp_from_year, gdp_to_year,
+        charts.gdp_deflator_line_chart, 'GDP Deflator over time', 'GDP Deflator (%)', 'gdp_highlight'
     )
     st.altair_chart(gdp_deflator_chart, use_container_width=True)
+    if selected_gdp_countries:
+        download_buttons([GDP_DEFLATOR_CODE], country_codes(gdp_lines_df, selected_gdp_countries), gdp_from_year, gdp_to_year, 'gdp_download')
 
     # MAP
-    # Get the unique years and countries in the data
-    years = gdp_deflator_df['Year'].unique()
-    countries = sorted(gdp_deflator_df['Country Name'].unique())  # Sort countries alphabetically for clarity
+    # Get the years and countries with data
+    years = gdp_coverage.years()
+    countries = sorted(gdp_coverage.countries(exclude=('Rollup',)))  # Sort countries alphabetically for clarity
+
+    # Either one year per rerun, or every year as animation frames scrubbed in the browser
+    map_mode = st.radio('Map mode', ['Single year', 'Animate all years'], horizontal=True, key='gdp_map_mode', bind='query-params')
 
     # Allow the user to select a single year
-    selected_year = st.select_slider(
-        'Select the year',
-        options=sorted(years),
-        value=int(years.min())
-    )
+    if map_mode == 'Single year':
+        selected_year = st.select_slider(
+            'Select the year',
+            options=years,
+            value=years[0],
+            key='gdp_map_year',
+            bind='query-params'
+        )
 
     # Checkbox to select all or none of the countries
-    select_all = st.checkbox('Select all countries', value=True)
+    select_all = st.checkbox('Select all countries', value=True, key='gdp_map_all', bind='query-params')
 
     # Multiselect widget for countries
     if select_all:
@@ -211,139 +192,96 @@ def show_Interactive_Data():
         selected_countries = st.multiselect(
             'Select the countries',
             options=countries,  # Dynamically populate from dataset
-            default=[]  # Start with no countries selected when checkbox is unchecked
+            default=[],  # Start with no countries selected when checkbox is unchecked
+            key='gdp_map_countries',
+            bind='query-params'
         )
 
-    # Filter the data for the selected year and countries
-    gdp_deflator_year_df = gdp_deflator_df[
-        (gdp_deflator_df['Year'] == selected_year) &
-        (gdp_deflator_df['Country Name'].isin(selected_countries))
-    ]
-
     # Create the choropleth map
-    world_map = new_func1(gdp_deflator_year_df)
-    # Create a base dataframe with all country codes and zero values for GDP Deflator
-    base_df = pd.DataFrame({
-        'Country Code': gdp_deflator_df['Country Code'].unique(),
-        'Country Name': gdp_deflator_df['Country Name'].unique(),
-        'GDP Deflator': [0] * len(gdp_deflator_df['Country Code'].unique())
-    })
-
-    # If countries are selected, update the values for those countries
-    if selected_countries:
-        gdp_deflator_year_df = gdp_deflator_df[
-            (gdp_deflator_df['Year'] == selected_year) &
-            (gdp_deflator_df['Country Name'].isin(selected_countries))
-        ]
-        # Update base_df with actual values where available
-        for idx, row in gdp_deflator_year_df.iterrows():
-            base_df.loc[base_df['Country Code'] == row['Country Code'], 'GDP Deflator'] = row['GDP Deflator']
-
-    # Create the map using the base_df instead of filtered data
-    world_map = go.Figure(data=go.Choropleth(
-        locations=base_df['Country Code'],
-        z=base_df['GDP Deflator'],
-        text=base_df['Country Name'],
-        colorscale='RdBu',
-        zmid=0,
-        autocolorscale=False,
-        reversescale=True,
-        marker_line_color='darkgray',
-        marker_line_width=0.5,
-        colorbar_title="GDP Deflator (%)"
-    ))
-
-    # Update the layout for the map
-    world_map.update_layout(
-        title_text=f'GDP Deflator in {selected_year}',
-        geo=dict(
-            showframe=False,
-            showcoastlines=False,
-            projection_type='equirectangular'
-        ),
-        annotations=[dict(
-            x=0.5,
-            y=-0.1,
-            xref='paper',
-            yref='paper',
-            text='Source: World Inequality Database',
-            showarrow=False
-        )]
-    )
+    if not selected_countries:
+        world_map = None
+        st.warning("Select at least one country")
+    elif map_mode == 'Single year':
+        if not gdp_coverage.available(selected_countries, selected_year, selected_year):
+            st.warning(f"None of the selected countries have GDP deflator data for {selected_year}")
+        world_map = cached_view(
+            'GDP deflator map', [GDP_DEFLATOR_CODE],
+            lambda year, countries: charts.gdp_deflator_map(gdp_deflator_df, year, countries),
+            year=selected_year, countries=selected_countries
+        )
+    else:
+        world_map = cached_view(
+            'GDP deflator animated map', [GDP_DEFLATOR_CODE],
+            lambda countries: charts.animated_choropleth(
+                gdp_deflator_df[gdp_deflator_df['Country Name'].isin(countries)],
+                'GDP Deflator',
+                f'GDP Deflator, {years[0]}-{years[-1]}',
+                'GDP Deflator (%)',
+                zmid=0
+            ),
+            countries=selected_countries
+        )
 
     # Display the map in the Streamlit app
-    st.plotly_chart(world_map, use_container_width=True, config={'scrollZoom': True})
+    if world_map is not None:
+        payload.log_payload('GDP deflator map', world_map)
+        st.plotly_chart(world_map, use_container_width=True, config={'scrollZoom': True})
 
     #-----------------#
 
-    # Variable selector for indicators
-    indicator_df = pd.read_csv(Path(__file__).parent.parent/'data/world_bank_popular_indicators.csv')
-
-    # Melt the dataset into long format
-    indicator_long_df = indicator_df.melt(
-        id_vars=['Series Name', 'Series Code', 'Country Name', 'Country Code'],
-        value_vars=[col for col in indicator_df.columns if 'YR' in col],
-        var_name='Year',
-        value_name='Value'
-    )
-
-    # Convert Year to numeric
-    indicator_long_df['Year'] = indicator_long_df['Year'].str.extract('(\d{4})').astype(int)
-
     st.header('Visualize Your Own Variable', divider='gray')
 
     # Select Series Name
-    series_names = indicator_long_df['Series Name'].unique()
-    selected_series = st.selectbox('Select a Variable', series_names)
+    indicator_names = get_indicator_names()
+    selected_series = st.selectbox('Select a Variable', list(indicator_names), key='indicator', bind='query-params')
 
-    # Filter data based on selected series
-    filtered_indicator_df = indicator_long_df[indicator_long_df['Series Name'] == selected_series]
+    # Load the selected series, with its regional and income-group rollups
+    indicator_df = get_series_with_rollups(indicator_names[selected_series])
+    indicator_coverage = get_coverage(indicator_names[selected_series])
 
     # Slider for years
-    indicator_min_year = filtered_indicator_df['Year'].min()
-    indicator_max_year = filtered_indicator_df['Year'].max()
+    indicator_min_year, indicator_max_year = indicator_coverage.year_range()
 
+    reset_if_out_of_range('indicator_years', indicator_min_year, indicator_max_year)
     indicator_from_year, indicator_to_year = st.slider(
         'Which years are you interested in?',
         min_value=int(indicator_min_year),
         max_value=int(indicator_max_year),
-        value=[int(indicator_min_year), int(indicator_max_year)]
+        value=[int(indicator_min_year), int(indicator_max_year)],
+        key='indicator_years',
+        bind='query-params'
     )
 
     # Multiselect for countries
-    indicator_countries = filtered_indicator_df['Country Name'].unique()
+    indicator_countries = indicator_coverage.countries(indicator_from_year, indicator_to_year)
     selected_indicator_countries = st.multiselect(
         'Which countries would you like to view?',
         indicator_countries,
-        ['United States', 'China', 'India']
+        indicator_coverage.available(['United States', 'China', 'India'], indicator_from_year, indicator_to_year),
+        key='indicator_countries',
+        bind='query-params'
     )
-
-    # Filter the data
-    filtered_indicator_df = filtered_indicator_df[
-        (filtered_indicator_df['Country Name'].isin(selected_indicator_countries)) &
-        (filtered_indicator_df['Year'] <= indicator_to_year) &
-        (filtered_indicator_df['Year'] >= indicator_from_year)
-    ]
+    st.caption(ROLLUP_CAPTION)
 
     # Create the chart
-    indicator_chart = alt.Chart(filtered_indicator_df).mark_line().encode(
-        x=alt.X('Year:O', title='Year', axis=alt.Axis(format='d', grid=True)),
-        y=alt.Y('Value:Q', title=selected_series, axis=alt.Axis(format=',.0f', tickCount=5, grid=True)),
-        color='Country Name:N',
-        tooltip=['Country Name', 'Year', 'Value']
-    ).properties(
-        title=f'{selected_series} over Time'
-    ).configure_axis(
-        gridDash=[5,5],
-        gridOpacity=0.5
+    indicator_chart = line_or_band_chart(
+        indicator_df, indicator_names[selected_series], 'Value', selected_indicator_countries, indicator_from_year, indicator_to_year,
+        lambda chart_df: charts.indicator_line_chart(chart_df, selected_series),
+        f'{selected_series} over Time', selected_series, 'indicator_highlight'
     )
 
     st.altair_chart(indicator_chart, use_container_width=True)
+    if selected_indicator_countries:
+        download_buttons(
+            [indicator_names[selected_series]], country_codes(indicator_df, selected_indicator_countries),
+            indicator_from_year, indicator_to_year, 'indicator_download'
+        )
 
 
 
     # Gini Coefficient Section
-    gini_df = get_gini_data()
+    gini_df = get_series_with_rollups(GINI_CODE)
+    gini_coverage = get_coverage(GINI_CODE)
     st.header(f'Gini Coefficient', divider='gray')
     st.markdown(r"""
 While the GDP deflator provides insights into how an economy is performing as a whole, it tells us nothing about how resources are distributed within that economy - this is why we turn to measures of inequality like the Gini coefficient.
@@ -404,44 +342,51 @@ which contains Gini Indexes for various countries over a range of years. The Gin
     st.subheader("Data: ")
     st.write(gini_df)
 
-    min_value = gini_df['Year'].min()
-    max_value = gini_df['Year'].max()
+    min_value, max_value = gini_coverage.year_range()
 
+    reset_if_out_of_range('gini_years', min_value, max_value)
     from_year, to_year = st.slider(
         'Which years are you interested in?',
         min_value=min_value,
         max_value=max_value,
-        value=[2011, 2016] if min_value <= 2011 <= max_value and min_value <= 2016 <= max_value else [min_value, max_value])
+        value=[2011, 2016] if min_value <= 2011 <= max_value and min_value <= 2016 <= max_value else [min_value, max_value],
+        key='gini_years',
+        bind='query-params')
+
+    # World Bank aggregates (regions, income groups, World, ...) are flagged at load time
+    exclude = ('Aggregate',) if st.checkbox('Exclude World Bank aggregates', value=False, key='gini_exclude_aggregates', bind='query-params') else ()
 
-    countries = gini_df['Country Name'].unique()
+    # Interpolated / carried-forward values, precomputed for the whole panel
+    gini_filled = st.checkbox(f'Fill gaps of up to {MAX_GAP} years', value=False, key='gini_fill_gaps', bind='query-params')
+    if gini_filled:
+        gini_df = get_filled_series(GINI_CODE)
+        gini_coverage = get_coverage(GINI_CODE, filled=True)
+        st.caption("Missing years between two surveys are interpolated linearly, and the latest survey is carried forward. Hollow points mark these filled-in values, and their metrics are labelled *(est.)*.")
+
+    # Only offer countries with a Gini estimate in the selected years
+    countries = gini_coverage.countries(from_year, to_year, exclude=exclude)
 
     if not len(countries):
-        st.warning("Select at least one country")
+        st.warning(f"No Gini data between {from_year} and {to_year}")
 
     selected_countries = st.multiselect(
         'Which countries would you like to view?',
         countries,
-        ['Germany', 'Brazil', 'Norway', 'United States', 'Estonia'])
-
-    # Filter the data
-    filtered_gini_df = gini_df[
-        (gini_df['Country Name'].isin(selected_countries))
-        & (gini_df['Year'] <= to_year)
-        & (from_year <= gini_df['Year'])
-    ]
+        gini_coverage.available(['Germany', 'Brazil', 'Norway', 'United States', 'Estonia'], from_year, to_year),
+        key='gini_countries',
+        bind='query-params')
+    st.caption(ROLLUP_CAPTION)
 
     st.header('Gini over time', divider='gray')
 
-    gini_chart = alt.Chart(filtered_gini_df).mark_line().encode(
-        x=alt.X('Year:O', title='Year', axis=alt.Axis(format='d')),
-        y=alt.Y('GINI:Q', title='GINI', axis=alt.Axis(format=',.0f', tickCount=5)),
-        color='Country Name:N',
-        tooltip=['Country Name', 'Year', 'GINI']
-    ).properties(
-        title='Gini Coefficient over Time'
+    gini_chart = line_or_band_chart(
+        gini_df, GINI_CODE, 'GINI', selected_countries, from_year, to_year, charts.gini_line_chart,
+        'Gini Coefficient over Time', 'GINI', 'gini_highlight', filled=gini_filled
     )
 
     st.altair_chart(gini_chart, use_container_width=True)
+    if selected_countries:
+        download_buttons([GINI_CODE], country_codes(gini_df, selected_countries), from_year, to_year, 'gini_download')
 
     first_year = gini_df[gini_df['Year'] == from_year]
     last_year = gini_df[gini_df['Year'] == to_year]
@@ -462,6 +407,11 @@ which contains Gini Indexes for various countries over a range of years. The Gin
             # Get Gini values for the selected country
             first_gini = first_year[first_year['Country Name'] == country]['GINI'].iat[0] if not first_year[first_year['Country Name'] == country].empty else None
             last_gini = last_year[last_year['Country Name'] == country]['GINI'].iat[0] if not last_year[last_year['Country Name'] == country].empty else None
+            # Values filled in by the gap-filling mode are marked as estimates
+            imputed = 'Imputed' in gini_df and (
+                first_year.loc[first_year['Country Name'] == country, 'Imputed'].any()
+                or last_year.loc[last_year['Country Name'] == country, 'Imputed'].any()
+            )
 
             # Handle missing values
             if first_gini is None or math.isnan(first_gini) or last_gini is None or math.isnan(last_gini):
@@ -474,16 +424,27 @@ which contains Gini Indexes for various countries over a range of years. The Gin
                 display_gini = f'{last_gini:.2f}'
 
             st.metric(
-                label=f'{country} Gini',
+                label=f'{country} Gini' + (' (est.)' if imputed else ''),
                 value=display_gini,
                 delta=growth,
                 delta_color=delta_color
             )
 
+    # Every year of the selected range as animation frames, played in the browser
+    gini_map = cached_view(
+        'Gini map', [GINI_CODE],
+        lambda from_year, to_year, filled: survey_map(gini_df, 'GINI', from_year, to_year, 'Gini Index', 'Gini Index'),
+        from_year=from_year, to_year=to_year, filled=gini_filled
+    )
+    if gini_map is not None:
+        payload.log_payload('Gini map', gini_map)
+        st.plotly_chart(gini_map, use_container_width=True, config={'scrollZoom': True})
+
     # Poverty Section
     st.header('Poverty Headcount Ratio', divider='gray')
 
-    poverty_df = get_poverty_data()
+    poverty_df = get_series_with_rollups(POVERTY_CODE)
+    poverty_coverage = get_coverage(POVERTY_CODE)
 
     # Poverty Headcount Ratio Dataset Information
     st.markdown("""
@@ -511,42 +472,230 @@ which contains Gini Indexes for various countries over a range of years. The Gin
     """)
 
     # Filter years and countries for poverty data
-    poverty_min_year = poverty_df['Year'].min()
-    poverty_max_year = poverty_df['Year'].max()
+    poverty_min_year, poverty_max_year = poverty_coverage.year_range()
 
+    reset_if_out_of_range('poverty_years', poverty_min_year, poverty_max_year)
     poverty_from_year, poverty_to_year = st.slider(
         'Which years are you interested in for poverty data?',
         min_value=int(poverty_min_year),
         max_value=int(poverty_max_year),
-        value=[int(poverty_min_year), int(poverty_max_year)]
+        value=[int(poverty_min_year), int(poverty_max_year)],
+        key='poverty_years',
+        bind='query-params'
     )
 
-    poverty_countries = poverty_df['Country Name'].unique()
+    poverty_exclude = ('Aggregate',) if st.checkbox('Exclude World Bank aggregates', value=False, key='poverty_exclude_aggregates', bind='query-params') else ()
+
+    poverty_filled = st.checkbox(f'Fill gaps of up to {MAX_GAP} years', value=False, key='poverty_fill_gaps', bind='query-params')
+    if poverty_filled:
+        poverty_df = get_filled_series(POVERTY_CODE)
+        poverty_coverage = get_coverage(POVERTY_CODE, filled=True)
+        st.caption("Missing years between two surveys are interpolated linearly, and the latest survey is carried forward. Hollow points mark these filled-in values.")
+
+    poverty_countries = poverty_coverage.countries(poverty_from_year, poverty_to_year, exclude=poverty_exclude)
+    if not poverty_countries:
+        st.warning(f"No poverty data between {poverty_from_year} and {poverty_to_year}")
     selected_poverty_countries = st.multiselect(
         'Which countries would you like to view for poverty data?',
         poverty_countries,
-        ['Argentina', 'Chile', 'Ethiopia']
+        poverty_coverage.available(['Argentina', 'Chile', 'Ethiopia'], poverty_from_year, poverty_to_year),
+        key='poverty_countries',
+        bind='query-params'
     )
-    
-    # Filter the Poverty Data
-    filtered_poverty_df = poverty_df[
-        (poverty_df['Country Name'].isin(selected_poverty_countries))
-        & (poverty_df['Year'] <= poverty_to_year)
-        & (poverty_df['Year'] >= poverty_from_year)
-    ]
-
-    poverty_chart = alt.Chart(filtered_poverty_df).mark_line().encode(
-        x=alt.X('Year:O', title='Year'),
-        y=alt.Y('Poverty Headcount Ratio:Q', title='Headcount Ratio (%)', axis=alt.Axis(format=',.0f', tickCount=5)),
-        color='Country Name:N',
-        tooltip=['Country Name', 'Year', 'Poverty Headcount Ratio']
-    ).properties(
-        title='Poverty Headcount Ratio at $2.15/day (2017 PPP)'
+    st.caption(ROLLUP_CAPTION)
+
+    poverty_chart = line_or_band_chart(
+        poverty_df, POVERTY_CODE, 'Poverty Headcount Ratio', selected_poverty_countries, poverty_from_year, poverty_to_year,
+        charts.poverty_line_chart, 'Poverty Headcount Ratio at $2.15/day (2017 PPP)', 'Headcount Ratio (%)', 'poverty_highlight',
+        filled=poverty_filled
     )
 
     st.altair_chart(poverty_chart, use_container_width=True)
+    if selected_poverty_countries:
+        download_buttons(
+            [POVERTY_CODE], country_codes(poverty_df, selected_poverty_countries),
+            poverty_from_year, poverty_to_year, 'poverty_download'
+        )
+
+    poverty_map = cached_view(
+        'Poverty map', [POVERTY_CODE],
+        lambda from_year, to_year, filled: survey_map(
+            poverty_df, 'Poverty Headcount Ratio', from_year, to_year, 'Poverty Headcount Ratio', 'Headcount Ratio (%)'
+        ),
+        from_year=poverty_from_year, to_year=poverty_to_year, filled=poverty_filled
+    )
+    if poverty_map is not None:
+        payload.log_payload('Poverty map', poverty_map)
+        st.plotly_chart(poverty_map, use_container_width=True, config={'scrollZoom': True})
+
+    # Biggest Movers Section
+    st.header('Biggest Movers', divider='gray')
+    st.markdown("""
+    Which countries moved the most over a period? Pick an indicator and a range of years to rank every country by how much it changed between its first and last observation, its compound annual growth rate, the slope of its linear trend, or how much it fluctuated around that trend. Countries need at least two observations in the range to be ranked.
+    """)
+
+    # Every series with a country x year panel: name -> code
+    all_series = panel_series()
+    selected_mover_series = st.selectbox('Select an indicator', list(all_series), key='movers_series', bind='query-params')
+    mover_code = all_series[selected_mover_series]
+
+    mover_min_year, mover_max_year = get_coverage(mover_code).year_range()
+    reset_if_out_of_range('movers_years', mover_min_year, mover_max_year)
+    mover_from_year, mover_to_year = st.slider(
+        'Which years should be compared?',
+        min_value=mover_min_year,
+        max_value=mover_max_year,
+        value=[mover_min_year, mover_max_year],
+        key='movers_years',
+        bind='query-params'
+    )
+    statistic = st.radio('Rank by', list(STATISTICS), format_func=STATISTICS.get, horizontal=True, key='movers_statistic', bind='query-params')
+    mover_count = st.slider('Countries in each list', min_value=3, max_value=20, value=10, key='movers_count', bind='query-params')
+    mover_exclude = ('Aggregate', 'Rollup') if st.checkbox('Countries only', value=True, key='movers_countries_only', bind='query-params') else ()
+
+    table_cols = [*MOVERS_COLUMNS, statistic]
+
+    top_movers_df, bottom_movers_df, movers_chart = cached_view(
+        'Biggest movers', [mover_code], movers_view,
+        code=mover_code, from_year=mover_from_year, to_year=mover_to_year, statistic=statistic, count=mover_count, exclude=mover_exclude
+    )
+
+    if movers_chart is None:
+        st.warning(f"Not enough {selected_mover_series} data between {mover_from_year} and {mover_to_year} to rank countries")
+    else:
+        st.altair_chart(movers_chart, use_container_width=True)
+
+        top_col, bottom_col = st.columns(2)
+        with top_col:
+            st.subheader('Largest')
+            st.dataframe(top_movers_df[table_cols], hide_index=True)
+        with bottom_col:
+            st.subheader('Smallest')
+            st.dataframe(bottom_movers_df[table_cols], hide_index=True)
+
+    # Compare Two Indicators Section
+    st.header('Compare Two Indicators', divider='gray')
+    st.markdown(f"""
+    How do two indicators relate across countries? Pick one for each axis and a year: every country is a bubble sized by its population and coloured by its region. Inequality and income per head, for instance, trace the famous [Kuznets curve](https://en.wikipedia.org/wiki/Kuznets_curve) debate.
+
+    The correlation matrix below it shows, for a chosen year, how closely every pair of indicators moves together across countries: close to 1 (red) when countries that score high on one also score high on the other, close to -1 (blue) when they score low, and near 0 when there is no linear relation. Each pair is compared over the countries with both values, and left blank when fewer than {MIN_COUNTRIES} have them.
+    """)
+
+    # All series of all countries, stacked once per data version
+    indicator_panel = get_indicator_panel()
+    series_list = list(all_series)
+
+    x_col, y_col = st.columns(2)
+    with x_col:
+        scatter_x = st.selectbox(
+            'Horizontal axis',
+            series_list,
+            index=series_list.index('GDP per capita (current US$)') if 'GDP per capita (current US$)' in series_list else 0,
+            key='scatter_x',
+            bind='query-params'
+        )
+        scatter_log_x = st.checkbox('Logarithmic scale', value=True, key='scatter_log_x', bind='query-params')
+    with y_col:
+        scatter_y = st.selectbox('Vertical axis', series_list, index=0, key='scatter_y', bind='query-params')
+        scatter_log_y = st.checkbox('Logarithmic scale', value=False, key='scatter_log_y', bind='query-params')
+
+    scatter_years = indicator_panel.years([all_series[scatter_x], all_series[scatter_y]])
+    if not scatter_years:
+        st.warning(f"No country has both {scatter_x} and {scatter_y} data in the same year")
+    else:
+        scatter_year = st.select_slider(
+            'Year of the comparison',
+            options=scatter_years,
+            value=scatter_years[-1],
+            key='scatter_year',
+            bind='query-params'
+        )
+
+        scatter_chart, scatter_countries, scatter_sized = cached_view(
+            'Indicator scatter', [all_series[scatter_x], all_series[scatter_y], POPULATION_CODE], scatter_view,
+            x=all_series[scatter_x], y=all_series[scatter_y], year=scatter_year, log_x=scatter_log_x, log_y=scatter_log_y
+        )
+        st.altair_chart(scatter_chart, use_container_width=True)
+        st.caption(
+            f"{scatter_countries} countries with both values in {scatter_year}."
+            + ("" if scatter_sized else f" There is no population data for {scatter_year}, so the bubbles all have the same size.")
+        )
+        download_buttons(
+            list(dict.fromkeys([all_series[scatter_x], all_series[scatter_y]])), [],
+            scatter_year, scatter_year, 'scatter_download'
+        )
+
+    correlation_year_options = correlation_years()
+    if correlation_year_options:
+        correlation_year = st.select_slider(
+            'Year of the correlations',
+            options=correlation_year_options,
+            value=correlation_year_options[-1],
+            key='correlation_year',
+            bind='query-params'
+        )
+
+        heatmap, strongest_df = cached_view(
+            'Correlation matrix', list(all_series.values()), correlation_view, year=correlation_year
+        )
+        st.altair_chart(heatmap)
+        st.subheader('Strongest correlations')
+        st.dataframe(
+            strongest_df.rename(columns={'X': 'Indicator', 'Y': 'Compared with'}),
+            hide_index=True,
+            column_config={'Correlation': st.column_config.NumberColumn(format='%.2f')}
+        )
+
+    # Download Data Section
+    st.header('Download Data', divider='gray')
+    st.markdown("""
+    Download the values behind the charts above for any indicators, countries and years, as CSV for spreadsheets or as Parquet for data analysis tools. Each row holds one value of one indicator for one country (or regional or income-group average) and year. The buttons under each chart download what that chart shows. Downloads hold the published values only, without the filled-in gaps.
+    """)
+
+    export_min_year, export_max_year = int(indicator_panel.all_years[0]), int(indicator_panel.all_years[-1])
+    selected_export_series = st.multiselect(
+        'Indicators to download',
+        series_list,
+        [series_list[0]],
+        key='export_series',
+        bind='query-params'
+    )
+    # Countries and rollups named as in the GDP deflator data, which lists every economy
+    export_countries = get_coverage(GDP_DEFLATOR_CODE).countries()
+    selected_export_countries = st.multiselect(
+        'Countries to download (all if empty)',
+        export_countries,
+        [],
+        key='export_countries',
+        bind='query-params'
+    )
+    st.caption(ROLLUP_CAPTION)
+    reset_if_out_of_range('export_years', export_min_year, export_max_year)
+    export_from_year, export_to_year = st.slider(
+        'Years to download',
+        min_value=export_min_year,
+        max_value=export_max_year,
+        value=[export_min_year, export_max_year],
+        key='export_years',
+        bind='query-params'
+    )
+    if not is_streaming():
+        st.caption("This server builds each file in memory before sending it, so very large downloads take a while to start. Run the dashboard with `streamlit run serve.py` to stream them instead.")
+    if not selected_export_series:
+        st.warning("Select at least one indicator to download")
+    else:
+        download_buttons(
+            [all_series[name] for name in selected_export_series], country_codes(gdp_lines_df, selected_export_countries),
+            export_from_year, export_to_year, 'export_download'
+        )
+
     # Income Distribution by Quintiles
 
+    # The WIID data is optional; without it the page ends here
+    if not (DATA_DIR/WIID_FILENAME).exists():
+        st.warning(f"The WIID data ({WIID_FILENAME}) is not available, so the income distribution sections are not shown.")
+        st.stop()
+
     # Load and prepare WIID data
     wiid_df = get_wiid_data()
 
@@ -579,8 +728,9 @@ which contains Gini Indexes for various countries over a range of years. The Gin
     Note: If your selected country doesn't appear in the plot, data for that country-year combination is not available in the WIID.
     """)
 
-    # First get available years
-    available_years = sorted(wiid_df['year'].unique())
+    # First get the years with quintile shares
+    quintile_coverage = get_wiid_coverage('quintiles')
+    available_years = quintile_coverage.years()
     if not available_years:
         st.warning("No data available")
         st.stop()
@@ -589,11 +739,13 @@ which contains Gini Indexes for various countries over a range of years. The Gin
     selected_year = st.select_slider(
         'Select Year for Visualization',
         options=available_years,
-        value=available_years[-1]
+        value=available_years[-1],
+        key='quintile_year',
+        bind='query-params'
     )
 
     # Filter countries that have data for the selected year
-    available_countries = sorted(wiid_df[wiid_df['year'] == selected_year]['country'].unique())
+    available_countries = sorted(quintile_coverage.countries(selected_year, selected_year))
     
     # Country selector with only available countries
     selected_wiid_countries = st.multiselect(
@@ -602,80 +754,28 @@ which contains Gini Indexes for various countries over a range of years. The Gin
         default=[
             country for country in ['Latvia', 'Estonia', 'Costa Rica', 'Bhutan', 'Belgium', 'Austria', 'Ecuador', 'Cyprus', 'Denmark']
             if country in available_countries
-        ] if available_countries else []
+        ] if available_countries else [],
+        key='quintile_countries',
+        bind='query-params'
     )
 
     if not selected_wiid_countries:
         st.warning("Please select at least one country to view income distribution data.")
         st.stop()
 
-    # Filter the data by selected countries and year
-    filtered_wiid_df = wiid_df[
-        (wiid_df['country'].isin(selected_wiid_countries)) &
-        (wiid_df['year'] == selected_year)
-    ]
+    def build_quintiles(countries, year):
+        melted_wiid_df = get_quintile_shares(wiid_df, list(countries), year)
+        if melted_wiid_df.empty:
+            return None
+        melted_wiid_df = payload.shape(melted_wiid_df, ['country', 'Quintile', 'Income Share'])
+        payload.log_payload('Quintile shares', melted_wiid_df)
+        return charts.quintile_chart(melted_wiid_df, year)
 
-    # Ensure the quintile columns are numeric
-    quintile_cols = ['q1', 'q2', 'q3', 'q4', 'q5']
-    filtered_wiid_df[quintile_cols] = filtered_wiid_df[quintile_cols].apply(pd.to_numeric, errors='coerce')
+    quintile_chart = cached_view('Quintile shares', [WIID_SERIES], build_quintiles, countries=selected_wiid_countries, year=selected_year)
 
-    # Create a cleaner view of quintile data
-    quintile_data = filtered_wiid_df[['country', 'year'] + quintile_cols].dropna()
-    
-    if quintile_data.empty:
+    if quintile_chart is None:
         st.warning("No quintile data available for the selected countries and year.")
     else:
-        # Melt the dataframe for visualization
-        melted_wiid_df = quintile_data.melt(
-            id_vars=['country', 'year'],
-            value_vars=quintile_cols,
-            var_name='Quintile',
-            value_name='Income Share'
-        ).groupby(['country', 'Quintile'], as_index=False).sum()
-
-        # Create more readable quintile labels
-        melted_wiid_df['Quintile'] = pd.Categorical(
-            melted_wiid_df['Quintile'].map({
-                'q1': '0-20%',
-                'q2': '20-40%',
-                'q3': '40-60%',
-                'q4': '60-80%',
-                'q5': '80-100%'
-            }),
-            categories=['0-20%', '20-40%', '40-60%', '60-80%', '80-100%'],
-            ordered=True
-        )
-
-        # Create the Altair chart with stacked bars
-        quintile_chart = alt.Chart(melted_wiid_df).mark_bar().encode(
-            x=alt.X('country:N', title='Country'),
-            y=alt.Y(
-                'Income Share:Q',
-                title='Income Share (%)',
-                stack='normalize',
-                axis=alt.Axis(format='.1f')
-            ),
-            color=alt.Color(
-                'Quintile:N',
-                title='Quintile',
-                scale=alt.Scale(scheme='spectral'),
-                sort=['Top 20%', 'Middle (upper) 20%', 'Middle 20%', 'Middle (lower) 20%', 'Bottom 20%']
-            ),
-            order=alt.Order('Quintile:N', sort='ascending'),
-            tooltip=[
-                alt.Tooltip('country:N', title='Country'),
-                alt.Tooltip('Quintile:N', title='Quintile')
-            ]
-        ).properties(
-            title=f'Income Distribution by Quintile ({selected_year})',
-            height=400
-        ).configure_axis(
-            labelFontSize=12,
-            titleFontSize=14
-        ).configure_title(
-            fontSize=16
-        )
-
         st.altair_chart(quintile_chart, use_container_width=True)
         # Add Palma ratio and other inequality metrics over time
         st.header('Income Inequality Ratios', divider='gray')
@@ -692,97 +792,61 @@ which contains Gini Indexes for various countries over a range of years. The Gin
         """)
 
         # Country selector for metrics
-        metric_countries = sorted(wiid_df['country'].unique())
+        ratios_coverage = get_wiid_coverage('ratios')
+        metric_countries = sorted(ratios_coverage.countries())
+        if not metric_countries:
+            st.warning("No inequality ratio data available")
+            st.stop()
         selected_metric_country = st.selectbox(
             'Select a country for inequality metrics',
             options=metric_countries,
-            index=metric_countries.index('Estonia') if 'Estonia' in metric_countries else 0
+            index=metric_countries.index('Estonia') if 'Estonia' in metric_countries else 0,
+            key='ratio_country',
+            bind='query-params'
         )
 
         # Filter available years for the selected country
-        available_years_for_country = sorted(wiid_df[wiid_df['country'] == selected_metric_country]['year'].unique())
+        available_years_for_country = ratios_coverage.years([selected_metric_country])
         
         # Time range selector for metrics
         default_min_year = 2005 if 2005 in available_years_for_country else min(available_years_for_country)
         default_max_year = 2021 if 2021 in available_years_for_country else max(available_years_for_country)
         
+        reset_if_out_of_range('ratio_years', min(available_years_for_country), max(available_years_for_country))
         metric_min_year, metric_max_year = st.slider(
             'Select time range for inequality metrics',
             min_value=int(min(available_years_for_country)),
             max_value=int(max(available_years_for_country)),
-            value=[int(default_min_year), int(default_max_year)]
+            value=[int(default_min_year), int(default_max_year)],
+            key='ratio_years',
+            bind='query-params'
         )
 
-        if metric_countries:
-            # Filter data for selected country and years
-            metrics_df = wiid_df[
-            (wiid_df['country'] == selected_metric_country) &
-            (wiid_df['year'] >= metric_min_year) &
-            (wiid_df['year'] <= metric_max_year)
-            ].copy()
-
-            # Ensure only one value per country per year
-            metrics_df = metrics_df.drop_duplicates(subset=['country', 'year'])
-
-            # Calculate upper middle to lower middle ratio
-            metrics_df['upper_middle_to_lower'] = metrics_df['q4'] / metrics_df['q2']
-
-            # Prepare data for plotting
-            metrics_long = pd.melt(
-            metrics_df,
-            id_vars=['country', 'year'],
-            value_vars=['palma', 'ratio_top20bottom20', 'upper_middle_to_lower'],
-            var_name='metric',
-            value_name='value'
-            )
-
-            # Create nicer labels for metrics
-            metrics_long['metric'] = metrics_long['metric'].map({
-            'palma': 'Palma Ratio',
-            'ratio_top20bottom20': 'Top20/Bottom20 Ratio',
-            'upper_middle_to_lower': 'Upper/Lower Middle Ratio'
-            })
-
         # Add ratio selector
         selected_ratios = st.multiselect(
             'Select ratios to display',
             ['Palma Ratio', 'Top20/Bottom20 Ratio', 'Upper/Lower Middle Ratio'],
-            ['Palma Ratio', 'Top20/Bottom20 Ratio', 'Upper/Lower Middle Ratio']
+            ['Palma Ratio', 'Top20/Bottom20 Ratio', 'Upper/Lower Middle Ratio'],
+            key='ratios',
+            bind='query-params'
         )
 
+        def build_ratios(country, from_year, to_year, ratios):
+            metrics_long = get_inequality_ratios(wiid_df, country, from_year, to_year)
+            # Filter for selected ratios
+            metrics_long = metrics_long[metrics_long['metric'].isin(ratios)]
+
+            metrics_long = payload.shape(metrics_long, ['country', 'year', 'metric', 'value'])
+            payload.log_payload('Inequality ratios', metrics_long)
+            return charts.inequality_ratios_chart(metrics_long, country)
+
         if not selected_ratios:
             st.warning("Please select at least one ratio to display.")
         else:
-            # Filter for selected ratios
-            metrics_long = metrics_long[metrics_long['metric'].isin(selected_ratios)]
-
-            # Create the chart with lines connecting consecutive years
-            metrics_chart = alt.Chart(metrics_long).mark_line(
-            point=True,
-            strokeWidth=2
-            ).encode(
-            x=alt.X('year:O', 
-                title='Year',
-                axis=alt.Axis(labelAngle=0)
-            ),
-            y=alt.Y('value:Q', 
-                title='Ratio Value',
-                scale=alt.Scale(zero=False)
-            ),
-            color=alt.Color('metric:N', 
-                title='Ratio Type',
-                legend=alt.Legend(
-                orient='top',
-                titleFontSize=12,
-                labelFontSize=11
-                )
-            ),
-            tooltip=['country:N', 'year:O', 'metric:N', 
-                alt.Tooltip('value:Q', format='.2f')]
-            ).properties(
-            title=f'Inequality Metrics Over Time for {selected_metric_country}',
-            height=400
-            ).interactive()
+            metrics_chart = cached_view(
+                'Inequality ratios', [WIID_SERIES], build_ratios,
+                country=selected_metric_country, from_year=metric_min_year, to_year=metric_max_year, ratios=selected_ratios
+            )
 
             st.altair_chart(metrics_chart, use_container_width=True)
             # Closing Section
@@ -796,35 +860,6 @@ which contains Gini Indexes for various countries over a range of years. The Gin
 
             For more detailed information and personalized assistance, check out our **Chatbot** feature at the top. The Chatbot can help answer your questions and provide additional information on inequality metrics, economic indicators, and more.
             """)
-def new_func1(gdp_deflator_year_df):
-    world_map = go.Figure(data=go.Choropleth(
-        locations=gdp_deflator_year_df['Country Code'],
-        z=gdp_deflator_year_df['GDP Deflator'],
-        text=gdp_deflator_year_df['Country Name'],
-        # Use colorblind-friendly diverging colorscale centered at 0
-        colorscale='RdBu',  # Red-Blue diverging colorscale that works well for colorblind viewers
-        zmid=0,  # Center the color scale at 0
-        autocolorscale=False,
-        reversescale=True,  # Makes blue represent positive values, red negative
-        marker_line_color='darkgray',
-        marker_line_width=0.5,
-        colorbar_title="GDP Deflator (%)"
-    ))
-    
-    return world_map
-
-def new_func(filtered_gdp_deflator_df):
-    gdp_deflator_chart = alt.Chart(filtered_gdp_deflator_df).mark_line().encode(
-        x=alt.X('Year:O', title='Year', axis=alt.Axis(format='d')),
-        y=alt.Y('GDP Deflator', 
-                title='GDP Deflator (%)',
-                axis=alt.Axis(format='.2f')),
-        color='Country Name:N',
-        tooltip=['Country Name', 'Year', 'GDP Deflator']
-    ).properties(
-        title='GDP Deflator over time'
-    )
-    st.altair_chart(gdp_deflator_chart, use_container_width=True)
 
 if __name__ == "__main__":
     show_Interactive_Data()
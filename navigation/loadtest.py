@@ -0,0 +1,379 @@
+"""Load test of the dashboard with many simultaneous browser sessions.
+
+    python -m navigation.loadtest [--sessions 20] [--duration 60] [--think-time 1] [--report report.json]
+
+Starts `streamlit run streamlit_app.py` on a free port, with the Chatbot pointed at
+a local stand-in for the OpenAI chat completions endpoint, and opens N sessions
+over Streamlit's websocket protocol, like N browser tabs. Each session loops over
+scripted interactions with the Interactive Data and Chatbot pages. Every rerun is
+timed from sending the widget change until the script finishes, and the server's
+resident memory is sampled throughout. The report has rerun latency percentiles
+per interaction, throughput and the RSS timeline.
+
+RSS is read from /proc, so the memory samples need Linux.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.asyncio.client import connect
+
+APP_PATH = Path(__file__).parent.parent/'streamlit_app.py'
+FAKE_API_KEY = 'sk-loadtest'
+CANNED_REPLY = (
+    'Inequality is usually measured with the Gini index, income shares of quintiles '
+    'and poverty headcount ratios; each captures a different part of the distribution.'
+)
+QUESTIONS = [
+    'What does a Gini index of 40 mean?',
+    'Why did poverty fall in East Asia?',
+    'What is the Palma ratio?',
+    'How does inflation affect inequality?',
+]
+
+
+# -----------------#
+# Stand-in for the OpenAI API
+
+def fake_openai_app(latency):
+    """Chat completions endpoint answering every request with CANNED_REPLY after `latency` seconds."""
+    async def chat_completions(request):
+        body = await request.json()
+        await asyncio.sleep(latency)
+        return JSONResponse({
+            'id': 'chatcmpl-loadtest',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', ''),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': CANNED_REPLY}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+        })
+
+    return Starlette(routes=[Route('/v1/chat/completions', chat_completions, methods=['POST'])])
+
+
+def start_fake_openai(port, latency):
+    server = uvicorn.Server(uvicorn.Config(fake_openai_app(latency), host='127.0.0.1', port=port, log_level='warning'))
+    threading.Thread(target=server.run, daemon=True).start()
+    return server
+
+
+# -----------------#
+# Dashboard server
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, openai_port, log_file, timeout=60):
+    """Start the dashboard in a subprocess and wait until it answers its health check."""
+    env = dict(os.environ, OPENAI_BASE_URL=f'http://127.0.0.1:{openai_port}/v1')
+    process = subprocess.Popen(
+        [
+            sys.executable, '-m', 'streamlit', 'run', str(APP_PATH),
+            '--server.headless', 'true',
+            '--server.port', str(port),
+            '--server.enableXsrfProtection', 'false',
+            '--server.fileWatcherType', 'none',
+            '--browser.gatherUsageStats', 'false',
+        ],
+        cwd=APP_PATH.parent,
+        env=env,
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Streamlit exited with code {process.returncode}')
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1) as response:
+                if response.read() == b'ok':
+                    return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'Streamlit did not start within {timeout}s')
+
+
+def rss_bytes(pid):
+    with open(f'/proc/{pid}/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+# -----------------#
+# Simulated browser sessions
+
+class Session:
+    """One browser tab: sends widget states over the websocket and times each rerun.
+
+    Widgets are looked up in the elements of the last rerun, by key or by label.
+    Values set with `set` are sent again on every rerun, like the frontend does;
+    triggers (button clicks, chat messages) are only sent with the next one.
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self.page_script_hash = ''
+        self.widgets = {}  # widget id -> (element type, element proto), from the last rerun
+        self.states = {}  # widget id -> WidgetState sent with every rerun
+        self.exceptions = []
+
+    async def __aenter__(self):
+        self.ws = await connect(self.url, subprotocols=['streamlit'], max_size=None)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.ws.close()
+
+    def find(self, key=None, label=None, element_type=None, nth=0):
+        matches = [
+            (widget_id, found_type, proto)
+            for widget_id, (found_type, proto) in self.widgets.items()
+            if (key is None or widget_id.endswith(f'-{key}'))
+            and (label is None or getattr(proto, 'label', None) == label)
+            and (element_type is None or found_type == element_type)
+        ]
+        if len(matches) <= nth:
+            raise LookupError(f'No widget with key={key!r} label={label!r} type={element_type!r}')
+        return matches[nth]
+
+    def options(self, key=None, label=None, nth=0):
+        return list(self.find(key, label, nth=nth)[2].options)
+
+    def set(self, value, key=None, label=None, nth=0):
+        widget_id, element_type, proto = self.find(key, label, nth=nth)
+        state = WidgetState(id=widget_id)
+        if element_type == 'slider' and proto.type == proto.SELECT_SLIDER:
+            state.string_array_value.data[:] = [str(v) for v in (value if isinstance(value, (list, tuple)) else [value])]
+        elif element_type == 'slider':
+            state.double_array_value.data[:] = value if isinstance(value, (list, tuple)) else [value]
+        elif element_type == 'multiselect':
+            state.string_array_value.data[:] = value
+        elif element_type in ('selectbox', 'radio', 'text_input'):
+            state.string_value = value
+        elif element_type == 'checkbox':
+            state.bool_value = value
+        else:
+            raise ValueError(f'Setting a {element_type} is not supported')
+        self.states[widget_id] = state
+
+    def click(self, key=None, label=None):
+        widget_id = self.find(key, label, element_type='button')[0]
+        return WidgetState(id=widget_id, trigger_value=True)
+
+    def chat(self, text):
+        state = WidgetState(id=self.find(element_type='chat_input')[0])
+        state.chat_input_value.data = text
+        return state
+
+    async def rerun(self, triggers=()):
+        """Rerun the script with the current widget states; returns the rerun time in seconds."""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ''
+        msg.rerun_script.page_script_hash = self.page_script_hash
+        msg.rerun_script.widget_states.widgets.extend([*self.states.values(), *triggers])
+
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        self.widgets = {}
+        while True:
+            forward_msg = ForwardMsg()
+            forward_msg.ParseFromString(await self.ws.recv())
+            kind = forward_msg.WhichOneof('type')
+            if kind == 'new_session':
+                self.page_script_hash = forward_msg.new_session.page_script_hash
+            elif kind == 'delta' and forward_msg.delta.WhichOneof('type') == 'new_element':
+                element = forward_msg.delta.new_element
+                element_type = element.WhichOneof('type')
+                proto = getattr(element, element_type)
+                if element_type == 'exception':
+                    self.exceptions.append(proto.message)
+                elif getattr(proto, 'id', ''):
+                    self.widgets[proto.id] = (element_type, proto)
+            elif kind == 'script_finished':
+                return time.perf_counter() - start
+
+
+# Scripted interactions, in order: (name, function applying them to a session and
+# returning the triggers to send). Steps whose widget isn't on the page are skipped.
+INTERACTIVE_DATA_STEPS = [
+    ('gdp years', lambda s: s.set((2005, 2012), label='Which years are you interested in for GDP deflator data?')),
+    ('gdp map year', lambda s: s.set(random.choice(s.options(label='Select the year')), label='Select the year')),
+    ('gdp animated map', lambda s: s.set('Animate all years', label='Map mode')),
+    ('custom variable', lambda s: s.set(random.choice(s.options(label='Select a Variable')), label='Select a Variable')),
+    ('gini years', lambda s: s.set((2000, 2020), label='Which years are you interested in?', nth=1)),
+    ('gini countries', lambda s: s.set(
+        random.sample(s.options(label='Which countries would you like to view?', nth=1), 5),
+        label='Which countries would you like to view?', nth=1
+    )),
+    ('gini fill gaps', lambda s: s.set(True, key='gini_fill_gaps')),
+    ('poverty aggregates', lambda s: s.set(True, key='poverty_exclude_aggregates')),
+    ('movers indicator', lambda s: s.set(random.choice(s.options(key='movers_series')), key='movers_series')),
+    ('movers statistic', lambda s: s.set(random.choice(s.options(key='movers_statistic')), key='movers_statistic')),
+    ('quintile year', lambda s: s.set(random.choice(s.options(label='Select Year for Visualization')), label='Select Year for Visualization')),
+    ('ratio country', lambda s: s.set(
+        random.choice(s.options(label='Select a country for inequality metrics')),
+        label='Select a country for inequality metrics'
+    )),
+    # Back to one year per rerun, so the next round's 'gdp map year' finds its slider
+    ('gdp single-year map', lambda s: s.set('Single year', label='Map mode')),
+]
+CHATBOT_STEPS = [
+    ('open chatbot', lambda s: [s.click(key='chatbot_btn')]),
+    ('enter api key', lambda s: s.set(FAKE_API_KEY, key='chatbot_api_key') or [s.click(label='Confirm')]),
+    ('ask chatbot', lambda s: [s.chat(random.choice(QUESTIONS))]),
+    ('back to data', lambda s: [s.click(key='Interactive_Data_btn')]),
+]
+
+
+async def run_session(url, deadline, args, results, active):
+    """Open one session and keep interacting until `deadline`; appends (time, step, latency, ok) to results."""
+    async with Session(url) as session:
+        active[0] += 1
+        try:
+            latency = await session.rerun()
+            results.append((time.perf_counter(), 'initial load', latency, not session.exceptions))
+            while time.perf_counter() < deadline:
+                steps = INTERACTIVE_DATA_STEPS + (CHATBOT_STEPS if random.random() < args.chat_share else [])
+                for name, step in steps:
+                    if args.think_time:
+                        await asyncio.sleep(random.expovariate(1 / args.think_time))
+                    if time.perf_counter() >= deadline:
+                        break
+                    try:
+                        triggers = step(session) or []
+                    except LookupError:
+                        continue
+                    errors_before = len(session.exceptions)
+                    latency = await session.rerun(triggers)
+                    results.append((time.perf_counter(), name, latency, len(session.exceptions) == errors_before))
+        finally:
+            active[0] -= 1
+
+
+async def sample_rss(pid, interval, stop, active, samples, start):
+    while not stop.is_set():
+        samples.append((time.perf_counter() - start, rss_bytes(pid), active[0]))
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_load(url, pid, args):
+    results = []
+    samples = []
+    active = [0]
+    stop = asyncio.Event()
+    start = time.perf_counter()
+    deadline = start + args.ramp_up + args.duration
+    sampler = asyncio.create_task(sample_rss(pid, args.sample_interval, stop, active, samples, start))
+
+    async def delayed_session(delay):
+        await asyncio.sleep(delay)
+        await run_session(url, deadline, args, results, active)
+
+    # Sessions join evenly over the ramp-up period
+    outcomes = await asyncio.gather(
+        *(delayed_session(args.ramp_up * i / args.sessions) for i in range(args.sessions)),
+        return_exceptions=True
+    )
+    stop.set()
+    await sampler
+    failures = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+    return [(t - start, name, latency, ok) for t, name, latency, ok in results], samples, failures
+
+
+# -----------------#
+# Report
+
+def latency_table(results):
+    """Count, p50, p95 and p99 rerun latency (ms) per step, and over all steps."""
+    by_step = {}
+    for _, name, latency, _ in results:
+        by_step.setdefault(name, []).append(latency)
+    by_step['all'] = [latency for _, _, latency, _ in results]
+    return {
+        name: dict(zip(['count', 'p50', 'p95', 'p99'], [len(latencies), *np.percentile(latencies, [50, 95, 99]) * 1000]))
+        for name, latencies in by_step.items() if latencies
+    }
+
+
+def print_report(results, samples, failures, args, elapsed):
+    table = latency_table(results)
+    print(f'\n{args.sessions} sessions, {elapsed:.0f}s, {len(results)} reruns, {len(results) / elapsed:.1f} reruns/s')
+    print(f'{"interaction":<22}{"count":>7}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}')
+    for name, row in table.items():
+        print(f'{name:<22}{row["count"]:>7}{row["p50"]:>10.0f}{row["p95"]:>10.0f}{row["p99"]:>10.0f}')
+
+    errors = sum(not ok for *_, ok in results)
+    if errors or failures:
+        print(f'\n{errors} reruns raised an exception, {len(failures)} sessions failed: {failures[:3]}')
+
+    # About 20 rows of the RSS timeline
+    print(f'\n{"t (s)":>7}{"RSS MB":>9}{"sessions":>10}')
+    for t, rss, active in samples[::max(1, len(samples) // 20)]:
+        print(f'{t:>7.0f}{rss / 2**20:>9.0f}{active:>10}')
+    if samples:
+        print(f'peak RSS {max(rss for _, rss, _ in samples) / 2**20:.0f} MB')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test the dashboard with simulated browser sessions.')
+    parser.add_argument('--sessions', type=int, default=20, help='Number of simultaneous sessions')
+    parser.add_argument('--duration', type=float, default=60, help='Seconds to keep all sessions running after the ramp-up')
+    parser.add_argument('--ramp-up', type=float, default=10, help='Seconds over which the sessions join')
+    parser.add_argument('--think-time', type=float, default=1.0, help='Mean pause between interactions, in seconds')
+    parser.add_argument('--chat-share', type=float, default=0.3, help='Share of rounds that also visit the Chatbot')
+    parser.add_argument('--openai-latency', type=float, default=0.5, help='Response time of the OpenAI stand-in, in seconds')
+    parser.add_argument('--sample-interval', type=float, default=1.0, help='Seconds between RSS samples')
+    parser.add_argument('--server-log', type=Path, help='Write the Streamlit server output to this file')
+    parser.add_argument('--report', type=Path, help='Write every rerun and RSS sample to this JSON file')
+    args = parser.parse_args(argv)
+
+    openai_port = free_port()
+    port = free_port()
+    openai_server = start_fake_openai(openai_port, args.openai_latency)
+    with open(args.server_log or os.devnull, 'w') as log_file:
+        process = start_server(port, openai_port, log_file)
+        try:
+            start = time.perf_counter()
+            results, samples, failures = asyncio.run(run_load(f'ws://127.0.0.1:{port}/_stcore/stream', process.pid, args))
+            elapsed = time.perf_counter() - start
+        finally:
+            process.terminate()
+            process.wait()
+            openai_server.should_exit = True
+
+    print_report(results, samples, failures, args, elapsed)
+    if args.report:
+        args.report.write_text(json.dumps({
+            'args': {key: str(value) for key, value in vars(args).items()},
+            'latency_ms': latency_table(results),
+            'reruns': [{'t': t, 'step': name, 'latency': latency, 'ok': ok} for t, name, latency, ok in results],
+            'rss': [{'t': t, 'rss_bytes': rss, 'sessions': active} for t, rss, active in samples],
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Shrink the frames behind the Interactive Data charts before they are sent to the browser.
+
+Streamlit ships an Altair chart's data as Arrow, so every column and every byte of
+precision in the frame goes over the wire on each rerun. `shape` keeps only the
+fields a chart encodes, rounds values to what the axes and tooltips show, and stores
+integers and repeated labels in the smallest dtype that holds them.
+`lines_or_bands` keeps line charts small whatever the selection, by summarizing
+more than MAX_SERIES countries as percentile bands. Set the navigation.payload
+logger to DEBUG to log the bytes sent per chart.
+"""
+import io
+import logging
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from inequality_data import get_percentile_bands
+from navigation import charts
+
+logger = logging.getLogger(__name__)
+
+# Decimals kept for float values
+DECIMALS = 2
+# Line charts with more countries than this show percentile bands instead (see charts.band_chart)
+MAX_SERIES = 12
+
+
+def downcast(series, decimals=DECIMALS):
+    """Round floats and store integers and repeated strings in the smallest dtype that holds them."""
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast='integer')
+    if pd.api.types.is_float_dtype(series):
+        # Rounded values stay float64: as float32 they would reach the browser as
+        # 1.2300000190734863 and show so in the tooltips
+        return series.round(decimals)
+    if series.nunique() < len(series) / 2:
+        return series.astype('category')
+    return series
+
+
+def shape(df, fields, decimals=DECIMALS):
+    """The columns of df a chart encodes, downcast."""
+    df = df[[field for field in fields if field in df]]
+    return df.apply(downcast, decimals=decimals)
+
+
+def lines_or_bands(filtered_df, value_col, countries, highlighted, line_chart, title, y_title):
+    """line_chart of the shaped frame, or percentile bands plus the highlighted countries for more than MAX_SERIES countries.
+
+    Used by both the Interactive Data page and the snapshot exporter, so that
+    snapshots look like the page for the same selection.
+    """
+    if len(countries) <= MAX_SERIES:
+        chart_df = shape(filtered_df, ['Country Name', 'Year', value_col, 'Imputed'])
+        log_payload(title, chart_df)
+        return line_chart(chart_df)
+
+    # One groupby over the whole selection; the chart size no longer depends on it
+    bands_df = shape(get_percentile_bands(filtered_df, value_col), ['Year', 'p10', 'p25', 'p50', 'p75', 'p90', 'Countries'])
+    highlight_df = shape(filtered_df[filtered_df['Country Name'].isin(highlighted)], ['Country Name', 'Year', value_col])
+    log_payload(f'{title} bands', bands_df)
+    log_payload(f'{title} highlights', highlight_df)
+    return charts.band_chart(bands_df, highlight_df, value_col, title, y_title)
+
+
+def payload_bytes(data):
+    """Bytes Streamlit sends for a chart's data: Arrow for frames, JSON for Plotly figures."""
+    if isinstance(data, go.Figure):
+        return len(data.to_json())
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.tell()
+
+
+def log_payload(name, data):
+    """Log the size of a chart's data; skipped entirely unless debug logging is on."""
+    if logger.isEnabledFor(logging.DEBUG):
+        rows = f'{len(data):,} rows, ' if isinstance(data, pd.DataFrame) else ''
+        logger.debug('Chart %r: %s%s bytes', name, rows, f'{payload_bytes(data):,}')
@@ -0,0 +1,365 @@
+"""Static snapshots of every dashboard chart for a grid of parameters.
+
+    python -m navigation.snapshots [--grid grid.json] [--out snapshots] [--workers N] [--force]
+
+Each chart is built with the same loaders and builders as show_Interactive_Data,
+including its switch from lines to percentile bands for large selections (see
+navigation.payload) and its animated maps, movers, scatter and correlation views
+(see navigation.views), and written as its Vega-Lite / Plotly JSON spec and as a
+standalone HTML page. Charts are rendered across a process pool. A manifest keeps
+a hash of each chart's input data and parameters, and charts whose inputs have not
+changed since the last export are skipped.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from inequality_data import (
+    GDP_DEFLATOR_CODE,
+    GINI_CODE,
+    POVERTY_CODE,
+    filter_series,
+    get_country_groups,
+    get_coverage,
+    get_cross_section,
+    get_correlations,
+    get_gdp_data,
+    get_indicator_names,
+    get_indicator_panel,
+    get_inequality_ratios,
+    get_quintile_shares,
+    get_series_frame,
+    get_series_with_rollups,
+    get_trends,
+    get_wiid_data,
+    rollups,
+)
+from inequality_data.rollups import POPULATION_CODE
+from inequality_data.store import DATA_DIR, WIID_FILENAME
+from inequality_data.trends import STATISTICS
+from navigation import charts, payload, views
+
+DEFAULT_OUT_DIR = Path(__file__).parent.parent/'snapshots'
+MANIFEST_FILENAME = 'manifest.json'
+
+# Parameter grid exported by default; override it with --grid. Line charts take
+# named groups of countries and/or a 'grouping' ('Region' or 'Income Group') that
+# adds one chart per group with its member countries, and an optional year range.
+# 'all' expands to every value available in the data.
+DEFAULT_GRID = {
+    'gdp_deflator_map': {'years': 'all'},
+    'gdp_deflator_lines': {'groups': {'default': ['United States', 'China', 'India']}},
+    'indicator_lines': {'series': 'all', 'groups': {'default': ['United States', 'China', 'India']}},
+    'gini_lines': {
+        'groups': {'default': ['Germany', 'Brazil', 'Norway', 'United States', 'Estonia']},
+        'grouping': 'Region',
+        'from_year': 2000,
+    },
+    'poverty_lines': {
+        'groups': {'default': ['Argentina', 'Chile', 'Ethiopia']},
+        'grouping': 'Region',
+    },
+    'quintiles': {
+        'years': 'all',
+        'countries': ['Latvia', 'Estonia', 'Costa Rica', 'Bhutan', 'Belgium', 'Austria', 'Ecuador', 'Cyprus', 'Denmark'],
+    },
+    'inequality_ratios': {'countries': 'all'},
+    'gini_map': {'from_year': 2011, 'to_year': 2016},
+    'poverty_map': {},
+    'movers': {'series': [GINI_CODE, POVERTY_CODE], 'statistics': 'all', 'count': 10},
+    'indicator_scatter': {'pairs': [['NY.GDP.PCAP.CD', GINI_CODE]], 'years': 'all', 'log_x': True},
+    'correlations': {'years': 'all'},
+}
+
+# Series code, value column, builder, title and y axis title of each line chart, as on the page
+LINE_CHARTS = {
+    'gdp_deflator_lines': (GDP_DEFLATOR_CODE, 'GDP Deflator', charts.gdp_deflator_line_chart, 'GDP Deflator over time', 'GDP Deflator (%)'),
+    'gini_lines': (GINI_CODE, None, charts.gini_line_chart, 'Gini Coefficient over Time', 'GINI'),
+    'poverty_lines': (
+        POVERTY_CODE, None, charts.poverty_line_chart, 'Poverty Headcount Ratio at $2.15/day (2017 PPP)', 'Headcount Ratio (%)'
+    ),
+}
+# Series code, value column, title and colour bar title of each animated survey map, as on the page
+SURVEY_MAPS = {
+    'gini_map': (GINI_CODE, 'GINI', 'Gini Index', 'Gini Index'),
+    'poverty_map': (POVERTY_CODE, 'Poverty Headcount Ratio', 'Poverty Headcount Ratio', 'Headcount Ratio (%)'),
+}
+# Countries highlighted over the bands of a large selection, like the page's default
+HIGHLIGHTED = 3
+WIID_CHARTS = ('quintiles', 'inequality_ratios')
+
+# Builder changes must re-render every chart, so their source is part of each hash
+BUILDERS_HASH = hashlib.sha256(b''.join(Path(module.__file__).read_bytes() for module in (charts, payload, views))).hexdigest()
+
+
+def slug(text):
+    return re.sub(r'[^a-z0-9]+', '-', str(text).lower()).strip('-')
+
+
+def line_chart_groups(spec, df):
+    """Named country groups of a line chart spec, including one group per region / income group."""
+    groups = dict(spec.get('groups', {}))
+    if 'grouping' in spec:
+        members = rollups.group_members(df, get_country_groups(), spec['grouping'])
+        groups.update({rollups.rollup_name(spec['grouping'], group): countries for group, countries in members.items()})
+    return groups
+
+
+def expand_grid(grid):
+    """Turn the grid config into a list of (name, kind, params) jobs."""
+    jobs = []
+    if 'gdp_deflator_map' in grid:
+        years = grid['gdp_deflator_map'].get('years', 'all')
+        if years == 'all':
+            years = sorted(get_gdp_data()['Year'].unique())
+        for year in years:
+            jobs.append((f'gdp_deflator_map/{year}', 'gdp_deflator_map', {'year': int(year)}))
+
+    for kind in LINE_CHARTS:
+        if kind not in grid:
+            continue
+        spec = grid[kind]
+        series_df = get_series_with_rollups(*LINE_CHARTS[kind][:2])
+        for group, countries in line_chart_groups(spec, series_df).items():
+            params = {'countries': countries, 'from_year': spec.get('from_year'), 'to_year': spec.get('to_year')}
+            jobs.append((f'{kind}/{slug(group)}', kind, params))
+
+    if 'indicator_lines' in grid:
+        spec = grid['indicator_lines']
+        series_codes = spec.get('series', 'all')
+        if series_codes == 'all':
+            series_codes = list(get_indicator_names().values())
+        for code in series_codes:
+            for group, countries in line_chart_groups(spec, get_series_with_rollups(code)).items():
+                params = {'series': code, 'countries': countries, 'from_year': spec.get('from_year'), 'to_year': spec.get('to_year')}
+                jobs.append((f'indicator_lines/{slug(code)}/{slug(group)}', 'indicator_lines', params))
+
+    for kind in SURVEY_MAPS:
+        if kind in grid:
+            spec = grid[kind]
+            from_year, to_year = get_coverage(SURVEY_MAPS[kind][0]).year_range()
+            params = {'from_year': spec.get('from_year', from_year), 'to_year': spec.get('to_year', to_year)}
+            jobs.append((f"{kind}/{params['from_year']}-{params['to_year']}", kind, params))
+
+    if 'movers' in grid:
+        spec = grid['movers']
+        statistics = list(STATISTICS) if spec.get('statistics', 'all') == 'all' else spec['statistics']
+        for code in spec['series']:
+            from_year, to_year = get_coverage(code).year_range()
+            for statistic in statistics:
+                params = {
+                    'code': code,
+                    'from_year': spec.get('from_year', from_year),
+                    'to_year': spec.get('to_year', to_year),
+                    'statistic': statistic,
+                    'count': spec.get('count', 10),
+                    'exclude': ['Aggregate', 'Rollup'],
+                }
+                jobs.append((f'movers/{slug(code)}/{slug(statistic)}', 'movers', params))
+
+    if 'indicator_scatter' in grid:
+        spec = grid['indicator_scatter']
+        for x, y in spec['pairs']:
+            years = spec.get('years', 'all')
+            if years == 'all':
+                years = get_indicator_panel().years([x, y])
+            for year in years:
+                params = {'x': x, 'y': y, 'year': int(year), 'log_x': spec.get('log_x', False), 'log_y': spec.get('log_y', False)}
+                jobs.append((f'indicator_scatter/{slug(x)}-{slug(y)}/{int(year)}', 'indicator_scatter', params))
+
+    if 'correlations' in grid:
+        years = grid['correlations'].get('years', 'all')
+        if years == 'all':
+            years = views.correlation_years()
+        for year in years:
+            jobs.append((f'correlations/{int(year)}', 'correlations', {'year': int(year)}))
+
+    if any(kind in grid for kind in WIID_CHARTS):
+        if not (DATA_DIR/WIID_FILENAME).exists():
+            print(f'{WIID_FILENAME} not found, skipping quintile and ratio charts.')
+            return jobs
+        wiid_df = get_wiid_data()
+
+    if 'quintiles' in grid:
+        spec = grid['quintiles']
+        years = spec.get('years', 'all')
+        if years == 'all':
+            years = sorted(wiid_df['year'].unique())
+        for year in years:
+            jobs.append((f'quintiles/{int(year)}', 'quintiles', {'year': int(year), 'countries': spec['countries']}))
+
+    if 'inequality_ratios' in grid:
+        spec = grid['inequality_ratios']
+        countries = spec.get('countries', 'all')
+        if countries == 'all':
+            countries = sorted(wiid_df['country'].unique())
+        for country in countries:
+            params = {'country': country, 'from_year': spec.get('from_year'), 'to_year': spec.get('to_year')}
+            jobs.append((f'inequality_ratios/{slug(country)}', 'inequality_ratios', params))
+    return jobs
+
+
+def year_range(df, params, year_col='Year'):
+    from_year = params.get('from_year')
+    to_year = params.get('to_year')
+    return (
+        from_year if from_year is not None else df[year_col].min(),
+        to_year if to_year is not None else df[year_col].max(),
+    )
+
+
+def prepare(kind, params):
+    """Return (input frames, function building the chart from them) for one job."""
+    if kind == 'gdp_deflator_map':
+        gdp_deflator_df = get_gdp_data()
+        countries = sorted(gdp_deflator_df['Country Name'].unique())
+        inputs = [
+            gdp_deflator_df[['Country Code', 'Country Name']].drop_duplicates(),
+            gdp_deflator_df[gdp_deflator_df['Year'] == params['year']],
+        ]
+        return inputs, lambda: charts.gdp_deflator_map(gdp_deflator_df, params['year'], countries)
+
+    if kind in LINE_CHARTS:
+        series_code, value_col, builder, title, y_title = LINE_CHARTS[kind]
+        df = get_series_with_rollups(series_code, value_col)
+        countries = params['countries']
+        filtered_df = filter_series(df, countries, *year_range(df, params))
+        return [filtered_df], lambda: payload.lines_or_bands(
+            filtered_df, value_col or get_series_frame(series_code)[1], countries, countries[:HIGHLIGHTED], builder, title, y_title
+        )
+
+    if kind == 'indicator_lines':
+        indicator_df = get_series_with_rollups(params['series'])
+        series_name = indicator_df['Series Name'].iat[0]
+        countries = params['countries']
+        filtered_df = filter_series(indicator_df, countries, *year_range(indicator_df, params))
+        return [filtered_df], lambda: payload.lines_or_bands(
+            filtered_df, 'Value', countries, countries[:HIGHLIGHTED],
+            lambda chart_df: charts.indicator_line_chart(chart_df, series_name), f'{series_name} over Time', series_name
+        )
+
+    if kind in SURVEY_MAPS:
+        series_code, value_col, title, colorbar_title = SURVEY_MAPS[kind]
+        df = get_series_with_rollups(series_code)
+        filtered_df = df[df['Year'].between(params['from_year'], params['to_year'])]
+        return [filtered_df], lambda: views.survey_map(
+            filtered_df, value_col, params['from_year'], params['to_year'], title, colorbar_title
+        )
+
+    if kind == 'movers':
+        trends_df = get_trends(params['code'], params['from_year'], params['to_year'])
+        build_params = dict(params, exclude=tuple(params['exclude']))
+        return [trends_df], lambda: views.movers_view(**build_params)[2]
+
+    if kind == 'indicator_scatter':
+        cross_section_df = get_cross_section(params['year'])[['Country Name', params['x'], params['y'], POPULATION_CODE]]
+        return [cross_section_df.dropna(subset=[params['x'], params['y']])], lambda: views.scatter_view(**params)[0]
+
+    if kind == 'correlations':
+        return [get_correlations(params['year'])], lambda: views.correlation_view(params['year'])[0]
+
+    if kind == 'quintiles':
+        melted_wiid_df = get_quintile_shares(get_wiid_data(), params['countries'], params['year'])
+        return [melted_wiid_df], lambda: charts.quintile_chart(melted_wiid_df, params['year'])
+
+    if kind == 'inequality_ratios':
+        wiid_df = get_wiid_data()
+        country_df = wiid_df[wiid_df['country'] == params['country']]
+        metrics_long = get_inequality_ratios(wiid_df, params['country'], *year_range(country_df, params, 'year'))
+        return [metrics_long], lambda: charts.inequality_ratios_chart(metrics_long, params['country'])
+
+    raise ValueError(f'Unknown chart kind: {kind}')
+
+
+def input_hash(kind, params, inputs):
+    digest = hashlib.sha256(json.dumps([kind, params, BUILDERS_HASH], sort_keys=True, default=str).encode())
+    for frame in inputs:
+        digest.update(','.join(map(str, frame.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def to_html(chart):
+    if isinstance(chart, go.Figure):
+        return chart.to_html(include_plotlyjs='cdn')
+    return chart.to_html()
+
+
+def render(job, previous_hash, out_dir, force=False):
+    """Render one job unless its inputs are unchanged. Returns (name, input hash, status)."""
+    name, kind, params = job
+    inputs, build = prepare(kind, params)
+    # The last input frame holds the plotted values
+    if inputs[-1].empty:
+        return name, None, 'no data'
+
+    digest = input_hash(kind, params, inputs)
+    json_path = out_dir/f'{name}.json'
+    html_path = out_dir/f'{name}.html'
+    if not force and digest == previous_hash and json_path.exists() and html_path.exists():
+        return name, digest, 'unchanged'
+
+    chart = build()
+    if chart is None:
+        return name, None, 'no data'
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+    json_path.write_text(chart.to_json())
+    html_path.write_text(to_html(chart))
+    return name, digest, 'rendered'
+
+
+def render_chunk(jobs_with_hashes, out_dir, force):
+    return [render(job, previous_hash, out_dir, force) for job, previous_hash in jobs_with_hashes]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export static snapshots of the dashboard charts.')
+    parser.add_argument('--grid', type=Path, help='JSON file with the parameter grid (defaults to DEFAULT_GRID)')
+    parser.add_argument('--out', type=Path, default=DEFAULT_OUT_DIR, help='Output directory')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes')
+    parser.add_argument('--force', action='store_true', help='Re-render charts whose inputs are unchanged')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    grid = json.loads(args.grid.read_text()) if args.grid else DEFAULT_GRID
+    jobs = expand_grid(grid)
+
+    manifest_path = args.out/MANIFEST_FILENAME
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    jobs_with_hashes = [(job, manifest.get(job[0])) for job in jobs]
+
+    # A few jobs per task keeps the pool busy without pickling one frame per chart
+    workers = args.workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunk_size = max(1, len(jobs_with_hashes) // (workers * 4))
+        chunks = [jobs_with_hashes[i:i + chunk_size] for i in range(0, len(jobs_with_hashes), chunk_size)]
+        results = [
+            result
+            for chunk_results in executor.map(partial(render_chunk, out_dir=args.out, force=args.force), chunks)
+            for result in chunk_results
+        ]
+
+    statuses = {}
+    new_manifest = {}
+    for name, digest, status in results:
+        statuses[status] = statuses.get(status, 0) + 1
+        if digest is not None:
+            new_manifest[name] = digest
+    args.out.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(new_manifest, indent=2, sort_keys=True))
+
+    summary = ', '.join(f'{count} {status}' for status, count in sorted(statuses.items()))
+    print(f'{len(results)} charts in {time.perf_counter() - start:.1f}s: {summary}')
+
+
+if __name__ == "__main__":
+    main()
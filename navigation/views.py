@@ -0,0 +1,132 @@
+"""Charts and tables of the Interactive Data page, cached across sessions.
+
+Every filter on the page is bound to the URL's query parameters, so a shared
+link opens the same view in every session that follows it. `cached_view` keeps
+what a view computes from its filters (filtered frames, shaped chart data, the
+chart itself) in process memory under a canonical key of those filters and of
+the versions of the series behind it: the first session to open a link builds
+the view and the others reuse it, until the data is refreshed.
+
+The builders of the views that take more than a chart builder (biggest movers,
+scatter, correlations, survey maps) live here too, without Streamlit, so that
+the snapshot exporter draws exactly what the page draws.
+"""
+import pandas as pd
+
+from inequality_data import (
+    GINI_CODE,
+    POVERTY_CODE,
+    get_correlations,
+    get_cross_section,
+    get_indicator_names,
+    get_indicator_panel,
+    get_trends,
+)
+from inequality_data.cache import MemoryCache
+from inequality_data.crosssection import MIN_COUNTRIES
+from inequality_data.loaders import rollup_version
+from inequality_data.rollups import POPULATION_CODE
+from inequality_data.store import series_version
+from inequality_data.trends import STATISTICS, movers
+from navigation import charts, payload
+
+# Views kept in memory; each is a chart with its shaped data, at most a few hundred KB
+MAX_VIEWS = 512
+
+_views = MemoryCache(MAX_VIEWS)
+
+# Survey series listed ahead of the popular indicators wherever the page offers every series
+SURVEY_SERIES = {
+    'Gini index': GINI_CODE,
+    'Poverty headcount ratio at $2.15 a day (2017 PPP)': POVERTY_CODE,
+}
+# Columns of the biggest movers tables, followed by the ranking statistic
+MOVERS_COLUMNS = ['Country Name', 'First Year', 'First Value', 'Last Year', 'Last Value']
+
+
+def canonical(value):
+    """Hashable form of a filter value; selections are sorted, so their order does not matter."""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(sorted(value))
+    return value
+
+
+def view_key(name, series, params):
+    """Cache key of a view: its name, the versions of its series (and of the rollups' inputs) and its canonical filters."""
+    versions = (*(series_version(code) for code in series), rollup_version())
+    return (name, versions, tuple(sorted((param, canonical(value)) for param, value in params.items())))
+
+
+def cached_view(name, series, build, **params):
+    """build(**params) with canonical filter values, shared by every session asking for the same view.
+
+    `series` lists the codes whose data the view is built from, so that a new
+    version of any of them builds the view again.
+    """
+    key = view_key(name, series, params)
+    return _views.get_or_compute(key, lambda: build(**dict(key[2])))
+
+
+def panel_series():
+    """Name -> code of every series with a country x year panel: Gini, poverty, then the popular indicators."""
+    return {**SURVEY_SERIES, **get_indicator_names()}
+
+
+def survey_map(series_df, value_col, from_year, to_year, title, colorbar_title):
+    """Animated map of the countries of a Gini or poverty frame, one frame per year of the range."""
+    return charts.animated_choropleth(
+        series_df[~series_df['Aggregate'] & ~series_df['Rollup'] & series_df['Year'].between(from_year, to_year)],
+        value_col,
+        f'{title}, {from_year}-{to_year}',
+        colorbar_title,
+        colorscale='YlOrRd',
+        reversescale=False
+    )
+
+
+def movers_view(code, from_year, to_year, statistic, count, exclude):
+    """(largest, smallest, chart) of the Biggest Movers; the chart is None when no country can be ranked."""
+    # Every country's statistics are computed once per indicator and range, then only ranked here
+    top_df, bottom_df = movers(get_trends(code, from_year, to_year), statistic, count, exclude)
+    if top_df.empty:
+        return top_df, bottom_df, None
+    movers_df = pd.concat([top_df, bottom_df]).drop_duplicates('Country Code')
+    movers_df = payload.shape(movers_df, [*MOVERS_COLUMNS, statistic], decimals=4)
+    payload.log_payload('Biggest movers', movers_df)
+    return top_df, bottom_df, charts.movers_chart(movers_df, statistic, STATISTICS[statistic])
+
+
+def scatter_view(x, y, year, log_x, log_y):
+    """(chart, countries plotted, whether any has population data) of series x against y across countries in `year`."""
+    names = {code: name for name, code in panel_series().items()}
+    # One cross-section per year, shared by every pair of axes
+    scatter_df = get_cross_section(year)[['Country Name', 'Region', x, y, POPULATION_CODE]]
+    scatter_df = scatter_df.set_axis(['Country Name', 'Region', 'X', 'Y', 'Population'], axis=1).dropna(subset=['X', 'Y'])
+    # Log scales cannot show zero or negative values
+    if log_x:
+        scatter_df = scatter_df[scatter_df['X'] > 0]
+    if log_y:
+        scatter_df = scatter_df[scatter_df['Y'] > 0]
+    scatter_df = payload.shape(scatter_df, ['Country Name', 'Region', 'X', 'Y', 'Population'], decimals=4)
+    payload.log_payload('Indicator scatter', scatter_df)
+    chart = charts.indicator_scatter_chart(scatter_df, names[x], names[y], year, log_x, log_y)
+    return chart, len(scatter_df), scatter_df['Population'].notna().any()
+
+
+def correlation_years():
+    """Years in which at least half of the panel series have enough countries to be correlated."""
+    panel = get_indicator_panel()
+    return panel.years(min_countries=MIN_COUNTRIES, min_series=len(panel.codes) // 2)
+
+
+def correlation_view(year):
+    """(heatmap, ten strongest pairs) of the correlations between every pair of series in `year`."""
+    names = {code: name for name, code in panel_series().items()}
+    corr_df = get_correlations(year)
+    corr_df = corr_df.assign(X=corr_df['X'].map(names), Y=corr_df['Y'].map(names))
+    # Each pair once, strongest first
+    pairs_df = corr_df[corr_df['X'] < corr_df['Y']].dropna(subset=['Correlation'])
+    strongest_df = pairs_df.loc[pairs_df['Correlation'].abs().sort_values(ascending=False).index[:10]]
+    corr_df = payload.shape(corr_df, ['X', 'Y', 'Correlation', 'Countries'])
+    payload.log_payload('Correlation matrix', corr_df)
+    return charts.correlation_heatmap(corr_df, year), strongest_df
@@ -0,0 +1,131 @@
+"""Warm the shared caches when the server starts, so the first visitor after a deploy
+does not pay for parsing the data and building the default charts.
+
+`start` runs the warm-up in a background thread: it loads every dataset and the
+derived tables the Interactive Data page reads (rollups, coverage, gap-filled
+series, WIID coverage), imports the other pages, then renders the default view
+of the page once so its charts are in the shared view cache (see
+navigation.views). `ready` is the readiness probe: 503 while warming, 200 once
+done. serve.py wires both into the server.
+"""
+import importlib
+import logging
+import threading
+import time
+
+from starlette.responses import JSONResponse
+from streamlit.logger import get_logger
+
+from inequality_data import (
+    GDP_DEFLATOR_CODE,
+    GINI_CODE,
+    POVERTY_CODE,
+    get_country_groups,
+    get_coverage,
+    get_filled_series,
+    get_gdp_data,
+    get_gini_data,
+    get_indicator_names,
+    get_poverty_data,
+    get_series_with_rollups,
+    get_wiid_coverage,
+    get_wiid_data,
+)
+from inequality_data.store import DATA_DIR, WIID_FILENAME
+from navigation.interactive_data import show_Interactive_Data
+
+logger = get_logger(__name__)
+
+# Pages streamlit_app.py imports besides Interactive Data; the Chatbot's LLM clients take over a second
+PAGE_MODULES = ('navigation.about', 'navigation.chatbot')
+
+_started = threading.Lock()
+_done = threading.Event()
+_seconds = None
+
+
+def warm_data():
+    """Load every dataset and derived table the Interactive Data page reads into the shared caches."""
+    get_gdp_data()
+    get_gini_data()
+    get_poverty_data()
+    get_country_groups()
+    get_series_with_rollups(GDP_DEFLATOR_CODE, 'GDP Deflator')
+
+    # Every indicator the page offers, so switching series does not parse anything either
+    for code in [GDP_DEFLATOR_CODE, GINI_CODE, POVERTY_CODE, *get_indicator_names().values()]:
+        get_series_with_rollups(code)
+        get_coverage(code)
+    for code in (GINI_CODE, POVERTY_CODE):
+        get_filled_series(code)
+        get_coverage(code, filled=True)
+
+    if (DATA_DIR/WIID_FILENAME).exists():
+        get_wiid_data()
+        get_wiid_coverage('quintiles')
+        get_wiid_coverage('ratios')
+
+
+def warm_views():
+    """Import every page and render the default Interactive Data view once, so its charts are in the shared view cache.
+
+    Outside a session Streamlit draws nothing and every widget returns its default
+    value, so this builds exactly the views a new session asks for. Without the
+    optional WIID data the page stops at its WIID sections, after every other view
+    is built.
+    """
+    for module in PAGE_MODULES:
+        importlib.import_module(module)
+
+    # Every st call made outside a session logs a warning about it
+    context_logger = logging.getLogger('streamlit.runtime.scriptrunner_utils.script_run_context')
+    level = context_logger.level
+    context_logger.setLevel(logging.ERROR)
+    try:
+        show_Interactive_Data()
+    except FileNotFoundError:
+        if (DATA_DIR/WIID_FILENAME).exists():
+            raise
+        logger.info('%s not found, skipping the WIID views', WIID_FILENAME)
+    finally:
+        context_logger.setLevel(level)
+
+
+def warm():
+    """Warm the data, then the default views, and log how long each took.
+
+    A failure is logged and the server still reports ready: the sessions then
+    build what is missing themselves, as they would without warming.
+    """
+    global _seconds
+    start = time.perf_counter()
+    try:
+        warm_data()
+        data_seconds = time.perf_counter() - start
+        warm_views()
+        logger.info(
+            'Caches warmed in %.1fs (data %.1fs, default views %.1fs)',
+            time.perf_counter() - start, data_seconds, time.perf_counter() - start - data_seconds
+        )
+    except Exception:
+        logger.exception('Cache warm-up failed after %.1fs', time.perf_counter() - start)
+    finally:
+        _seconds = time.perf_counter() - start
+        _done.set()
+
+
+def start():
+    """Start warming in a background thread; later calls do nothing."""
+    if _started.acquire(blocking=False):
+        threading.Thread(target=warm, name='cache-warmup', daemon=True).start()
+
+
+def is_ready():
+    return _done.is_set()
+
+
+async def ready(request):
+    """Readiness probe for the load balancer: 503 until the warm-up is done."""
+    if not is_ready():
+        return JSONResponse({'status': 'warming'}, status_code=503)
+    return JSONResponse({'status': 'ready', 'warmup_seconds': round(_seconds, 1)})
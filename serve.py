@@ -0,0 +1,36 @@
+"""Serve the dashboard with its caches warmed at startup and a readiness probe.
+
+    streamlit run serve.py          (or: uvicorn serve:app --port 8501)
+
+Runs streamlit_app.py like `streamlit run streamlit_app.py` does, and in addition
+starts warming the shared caches in the background as soon as the server starts
+(see navigation.warmup). GET /ready answers 503 until warming is done and 200
+after, for the load balancer; /_stcore/health is up from the start.
+
+The query API (inequality_data.api) is mounted under /api, and the page's
+download buttons link to its streaming /api/export route.
+"""
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import streamlit as st
+from starlette.routing import Mount, Route
+
+from inequality_data import api
+from navigation import downloads, warmup
+
+
+@asynccontextmanager
+async def lifespan(app):
+    warmup.start()
+    yield
+
+
+# Relative to the page, so it also works under a server.baseUrlPath
+downloads.EXPORT_URL = 'api/export'
+
+app = st.App(
+    Path(__file__).parent/'streamlit_app.py',
+    lifespan=lifespan,
+    routes=[Route('/ready', warmup.ready), Mount('/api', app=api.app)],
+)
@@ -19,6 +19,13 @@ st.markdown(
     unsafe_allow_html=True
 )
 
+# Value of the `page` query parameter -> page, so that links open the page they were shared from
+PAGES = {'about': 'About', 'data': 'Interactive Data', 'chatbot': 'Chatbot'}
+
+def go_to(page):
+    st.session_state.page = page
+    st.query_params['page'] = next(slug for slug, name in PAGES.items() if name == page)
+
 def show_navigation_buttons():
     col1, col2, col3 = st.columns(3)
     
@@ -49,7 +56,7 @@ def show_navigation_buttons():
     else:
         col1.markdown(default_style, unsafe_allow_html=True)
     if col1.button("🔍 About", key="about_btn"):
-        st.session_state.page = "About"
+        go_to("About")
     
     # Interactive Data button
     if st.session_state.page == "Interactive Data":
@@ -57,7 +64,7 @@ def show_navigation_buttons():
     else:
         col2.markdown(default_style, unsafe_allow_html=True)
     if col2.button("📊 Interactive Data", key="Interactive_Data_btn"):
-        st.session_state.page = "Interactive Data"
+        go_to("Interactive Data")
     
     # Chatbot button
     if st.session_state.page == "Chatbot":
@@ -65,11 +72,11 @@ def show_navigation_buttons():
     else:
         col3.markdown(default_style, unsafe_allow_html=True)
     if col3.button("💬 Chatbot", key="chatbot_btn"):
-        st.session_state.page = "Chatbot"
+        go_to("Chatbot")
    
-# Initialize session state for page navigation
+# Initialize session state for page navigation, from the link's `page` parameter if it has one
 if "page" not in st.session_state:
-    st.session_state.page = "Interactive Data"
+    st.session_state.page = PAGES.get(st.query_params.get("page"), "Interactive Data")
 
 # Show navigation buttons at the top
 show_navigation_buttons()